@@ -1,19 +1,23 @@
+import os
+import re
+import time
+import base64
+import binascii
+import hashlib
+import queue
+import atexit
 import shutil
 import socket
-import requests
+import string
 import threading
 import urllib.parse
 
-from email.errors import HeaderParseError
-from functools import wraps
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps, lru_cache
 from pathlib import Path
-from typing import Any, List, Dict, Tuple, Union, Optional
-
-import smtplib
-from email.mime.text import MIMEText
-from email.header import Header
-from email.mime.multipart import MIMEMultipart
-from email.mime.image import MIMEImage
+from types import MappingProxyType
+from typing import Any, List, Dict, Tuple, Union, Optional, Mapping, Sequence
 
 from apscheduler.schedulers.background import BackgroundScheduler
 
@@ -23,7 +27,92 @@ from app.log import logger
 from app.plugins import _PluginBase
 from app.schemas.types import EventType, NotificationType
 
-SmtpMsgLock = threading.Lock()
+# 收件人分隔符，忽略逗号两侧的空白
+_RECEIVER_SPLIT_RE = re.compile(r"\s*,\s*")
+# 默认超时时间（秒）
+_DEFAULT_TIMEOUT = 10.0
+# 建立连接的最多尝试次数，以及首次重试前的等待时间（秒），之后每次翻倍
+_CONNECT_ATTEMPTS = 3
+_CONNECT_BACKOFF = 0.5
+# base64 编码的图片数据，如 data:image/png;base64,...，图片格式按解码后的文件头判断
+_BASE64_IMAGE_RE = re.compile(r'^data:image/[a-zA-Z0-9.+-]+;base64,(?P<base64_data>\S+)$', re.IGNORECASE)
+# 获取图片时支持的 URL 协议
+_URL_SCHEMES = frozenset(urllib.parse.uses_netloc)
+# 使用 Github 加速站获取图片的域名，包括其子域名
+_GITHUB_DOMAINS = frozenset((
+    'github.com', 'githubapp.com', 'githubengineering.com', 'githubstatus.com', 'github.blog',
+    'githubusercontent.com', 'github.dev', 'githubtraining.com', 'github.io', 'githubcloud.com', 'githubpages.com',
+))
+_GITHUB_DOMAIN_SUFFIXES = tuple(f".{domain}" for domain in _GITHUB_DOMAINS)
+# 获取图片的大小上限（字节）
+_MAX_IMAGE_SIZE = 10 * 1024 * 1024
+# 图片文件头与对应的 MIME 子类型
+_IMAGE_SIGNATURES = (
+    (b'\x89PNG\r\n\x1a\n', 'png'),
+    (b'\xff\xd8\xff', 'jpeg'),
+    (b'GIF87a', 'gif'),
+    (b'GIF89a', 'gif'),
+    (b'BM', 'bmp'),
+    (b'II*\x00', 'tiff'),
+    (b'MM\x00*', 'tiff'),
+)
+# 测试邮件参数：(消息类型, 内容, 用户ID)
+_TEST_MESSAGE = ("测试邮件", "这是一封测试邮件~~~", "测试用户")
+
+# 日志等级：(状态, 日志方法, 是否仅在记录更多日志时输出)
+_LOG_LEVELS: Dict[Optional[int], Tuple[str, str, bool]] = {
+    0: ("状态", "info", False),
+    1: ("汇报", "info", True),
+    2: ("警告", "warning", False),
+    3: ("汇报", "info", False),
+    -1: ("错误", "error", False),
+}
+_UNKNOWN_LOG_LEVEL = ("未知", "warning", False)
+# 运行完成的日志等级
+_SUCCESS_LOG_LEVELS = frozenset((0, 1, 2))
+
+# 发送结果汇报：(主服务器结果, 备用服务器结果) -> 汇报内容，结果为 None 表示未调用该服务器
+_RESULT_MESSAGES: Dict[Tuple[Optional[bool], Optional[bool]], str] = {
+    (True, None): "主服务器发送{test_type}邮件成功！",
+    (False, None): "主服务器发送{test_type}邮件失败！",
+    (None, True): "备用服务器发送{test_type}邮件成功！",
+    (None, False): "备用服务器发送{test_type}邮件失败！",
+    (True, True): "主服务器发送{test_type}邮件成功！ 备用服务器发送{test_type}邮件成功！",
+    (True, False): "主服务器发送{test_type}邮件成功！ 备用服务器发送{test_type}邮件失败！",
+    (False, True): "主服务器发送{test_type}邮件失败！ 备用服务器发送{test_type}邮件成功！",
+    (False, False): "主服务器发送{test_type}邮件失败！ 备用服务器发送{test_type}邮件失败！",
+    (None, None): "未启用主服务器与备用服务器！无法发送{test_type}邮件！",
+}
+
+# 按 (服务器地址, 端口) 划分的发送锁，不同服务器之间可以同时发送
+_host_locks: Dict[tuple, threading.Lock] = {}
+_host_locks_guard = threading.Lock()
+
+# 获取图片使用的 HTTP 会话，首次使用时创建
+_http_session = None
+_http_session_guard = threading.Lock()
+
+# 网络图片缓存：URL -> (过期时间, 图片数据)，超出数量时淘汰最久未使用的图片
+_url_images: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+_url_images_guard = threading.Lock()
+_URL_IMAGE_CACHE_SIZE = 32
+_URL_IMAGE_CACHE_TTL = 3600
+# 超过该大小（字节）的图片不缓存，网络图片、本地图片与 base64 编码结果共用
+_IMAGE_CACHE_MAX_BYTES = 1024 * 1024
+
+# 配置页面中结构相同的节点，相同内容只保留一份
+_shared_nodes: Dict[tuple, Any] = {}
+
+
+class SmtpMsgLogRecord:
+    """
+    单次调用的日志记录，由日志装饰器创建并传入被装饰方法
+    """
+    __slots__ = ('msg', 'level')
+
+    def __init__(self):
+        self.msg = "没有日志"
+        self.level = 1
 
 
 class SmtpMsgDecorator:
@@ -53,33 +142,22 @@ class SmtpMsgDecorator:
         def log_decorator(func):
             @wraps(func)
             def log_wrapper(*args, **kwargs):
-                logs = {'msg': "没有日志", 'level': 1}
+                logs = SmtpMsgLogRecord()
                 try:
                     if cls.log_more:
                         logger.info(f"日志汇报 - 状态 - {mode_name}模块 - 开始运行")
                     result = func(*args, log_container=logs, **kwargs)
                     return result
                 except Exception as e:
-                    logs['msg'] = f"{mode_name}模块 运行失败 - 原因 - {e}"
-                    logs['level'] = -1
-                    raise Exception(logs['msg'])
+                    logs.msg = f"{mode_name}模块 运行失败 - 原因 - {e}"
+                    logs.level = -1
+                    raise Exception(logs.msg) from e
                 finally:
-                    level = logs['level']
-                    msg = logs['msg']
-                    if level == 0:
-                        logger.info(f"日志汇报 - 状态 - {msg}")
-                    elif level == 1:
-                        if cls.log_more:
-                            logger.info(f"日志汇报 - 汇报 - {msg}")
-                    elif level == 3:
-                        logger.info(f"日志汇报 - 汇报 - {msg}")
-                    elif level == 2:
-                        logger.warning(f"日志汇报 - 警告 - {msg}")
-                    elif level == -1:
-                        logger.error(f"日志汇报 - 错误 - {msg}")
-                    else:
-                        logger.warning(f"日志汇报 - 未知 - {msg}")
-                    if level == (0 or 1 or 2):
+                    level = logs.level
+                    status, method, log_more_only = _LOG_LEVELS.get(level, _UNKNOWN_LOG_LEVEL)
+                    if cls.log_more or not log_more_only:
+                        getattr(logger, method)(f"日志汇报 - {status} - {logs.msg}")
+                    if cls.log_more and level in _SUCCESS_LOG_LEVELS:
                         logger.info(f"日志汇报 - 状态 - {mode_name}模块 - 运行完成")
             return log_wrapper
         return log_decorator
@@ -113,6 +191,818 @@ class SmtpMsgDecorator:
         return clean_log_decorator
 
 
+class SmtpMsgConnectionPool:
+    """
+    SMTP连接池，按 (服务器地址, 端口, 加密方式, 账号, 密码摘要) 复用已认证的连接
+    """
+    # 连接最长复用时间（秒）
+    max_age = 100
+    # 单个连接最多发送的邮件数量
+    max_messages = 100
+
+    _lock = threading.Lock()
+    _idle: Dict[tuple, Any] = {}
+    _stats: Dict[Any, List] = {}
+
+    @classmethod
+    def acquire(cls, key: tuple):
+        """
+        取出可复用的连接，使用 RSET 检查连接是否存活，不可用时返回 None
+        """
+        with cls._lock:
+            server = cls._idle.pop(key, None)
+            stats = cls._stats.get(server)
+        if server is None:
+            return None
+        import smtplib
+        if stats and (time.monotonic() - stats[0] > cls.max_age or stats[1] >= cls.max_messages):
+            cls.discard(server)
+            return None
+        try:
+            code, _ = server.rset()
+            if code == 250:
+                return server
+        except (smtplib.SMTPException, OSError):
+            pass
+        cls.discard(server)
+        return None
+
+    @classmethod
+    def release(cls, key: tuple, server):
+        """
+        发送完成后放回连接池
+        """
+        with cls._lock:
+            stats = cls._stats.setdefault(server, [time.monotonic(), 0])
+            stats[1] += 1
+            if stats[1] >= cls.max_messages or time.monotonic() - stats[0] > cls.max_age:
+                expired = server
+            else:
+                expired = cls._idle.pop(key, None)
+                cls._idle[key] = server
+        if expired is not None:
+            cls.discard(expired)
+
+    @classmethod
+    def discard(cls, server):
+        """
+        关闭连接，不再复用
+        """
+        import smtplib
+        with cls._lock:
+            cls._stats.pop(server, None)
+        try:
+            server.quit()
+        except (smtplib.SMTPException, OSError):
+            server.close()
+
+    @classmethod
+    def close_all(cls):
+        """
+        关闭连接池内所有连接
+        """
+        with cls._lock:
+            servers = list(cls._idle.values())
+            cls._idle.clear()
+        for server in servers:
+            cls.discard(server)
+
+
+atexit.register(SmtpMsgConnectionPool.close_all)
+
+
+class SmtpMsgTemplate:
+    """
+    预解析的邮件模板，渲染时只做变量替换
+    """
+    _conversions = {'r': repr, 's': str, 'a': ascii}
+
+    def __init__(self, content: str):
+        self.content = content
+        self._parts: Optional[List[tuple]] = None
+
+    def __parse(self) -> List[tuple]:
+        """
+        按 str.format 的语法拆分模板，含复杂字段或未知转换符时返回空列表，渲染时退回 str.format
+        """
+        parts = []
+        for literal, field, spec, conversion in string.Formatter().parse(self.content):
+            if field is not None and (not field.isidentifier() or "{" in spec
+                                      or (conversion and conversion not in self._conversions)):
+                return []
+            parts.append((literal, field, self._conversions.get(conversion), spec))
+        return parts
+
+    def render(self, **kwargs) -> str:
+        """
+        渲染模板，行为与 str.format 一致
+        """
+        if self._parts is None:
+            self._parts = self.__parse()
+        if not self._parts:
+            return self.content.format(**kwargs)
+        html = []
+        for literal, field, conversion, spec in self._parts:
+            html.append(literal)
+            if field is not None:
+                value = kwargs[field]
+                if conversion:
+                    value = conversion(value)
+                html.append(format(value, spec))
+        return "".join(html)
+
+
+def _host_lock(host, port) -> threading.Lock:
+    """
+    获取服务器对应的发送锁
+    """
+    with _host_locks_guard:
+        return _host_locks.setdefault((host, port), threading.Lock())
+
+
+def _get_http_session():
+    """
+    获取复用连接的 HTTP 会话
+    """
+    global _http_session
+    if _http_session is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        with _http_session_guard:
+            if _http_session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _http_session = session
+    return _http_session
+
+
+def _download_image(url: str, proxies, timeout: float) -> bytes:
+    """
+    流式获取图片数据，超过大小上限时立即放弃，避免异常响应长时间占用连接与内存
+    """
+    with _get_http_session().get(url=url, proxies=proxies, timeout=timeout, stream=True) as response:
+        if response.status_code != 200:
+            raise Exception(f"状态码：{response.status_code}")
+        if int(response.headers.get("Content-Length") or 0) > _MAX_IMAGE_SIZE:
+            raise Exception(f"图片大小超过 {_MAX_IMAGE_SIZE // 1024 // 1024}MB")
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            size += len(chunk)
+            if size > _MAX_IMAGE_SIZE:
+                raise Exception(f"图片大小超过 {_MAX_IMAGE_SIZE // 1024 // 1024}MB")
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+
+def _classify_image(image) -> Tuple[str, Optional[re.Match]]:
+    """
+    判断图片参数的类型：bytes、base64、url、file（路径字符串或 PathLike 对象），无法识别时返回 unknown；
+    base64 类型同时返回匹配结果，解码时直接使用，其余类型为 None
+    """
+    if isinstance(image, (bytes, bytearray)):
+        return "bytes", None
+    if isinstance(image, os.PathLike):
+        return "file", None
+    if not isinstance(image, str):
+        return "unknown", None
+    match = _BASE64_IMAGE_RE.match(image)
+    if match:
+        return "base64", match
+    parsed_url = urllib.parse.urlsplit(image)
+    if parsed_url.scheme and parsed_url.scheme in _URL_SCHEMES and parsed_url.netloc:
+        return "url", None
+    try:
+        if Path(image).is_file():
+            return "file", None
+    except (OSError, ValueError):
+        pass
+    return "unknown", None
+
+
+def _get_cached_url_image(url: str) -> Optional[bytes]:
+    """
+    读取缓存的网络图片，未缓存或已过期时返回 None
+    """
+    with _url_images_guard:
+        entry = _url_images.get(url)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del _url_images[url]
+            return None
+        _url_images.move_to_end(url)
+        return entry[1]
+
+
+def _cache_url_image(url: str, image_data: bytes):
+    """
+    缓存网络图片
+    """
+    if len(image_data) > _IMAGE_CACHE_MAX_BYTES:
+        return
+    with _url_images_guard:
+        _url_images[url] = (time.monotonic() + _URL_IMAGE_CACHE_TTL, image_data)
+        _url_images.move_to_end(url)
+        while len(_url_images) > _URL_IMAGE_CACHE_SIZE:
+            _url_images.popitem(last=False)
+
+
+def _connection_reusable(server, error: Optional[BaseException]) -> bool:
+    """
+    发送失败后判断连接是否仍可复用，服务器拒收地址或数据时已重置会话，连接本身不受影响；
+    收到 421 时连接已被关闭，不再复用
+    """
+    import smtplib
+    if server is None or getattr(server, "sock", None) is None:
+        return False
+    while error is not None:
+        if isinstance(error, (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError)):
+            return True
+        error = error.__cause__
+    return False
+
+
+def _parse_timeout(value) -> float:
+    """
+    解析超时时间，为空、非正数或无法解析时使用默认值，避免连接无限阻塞
+    """
+    try:
+        timeout = float(value)
+    except (TypeError, ValueError):
+        return _DEFAULT_TIMEOUT
+    return timeout if timeout > 0 else _DEFAULT_TIMEOUT
+
+
+def _content_digest(data: bytes) -> bytes:
+    """
+    计算内容摘要，用于快速判断模板内容是否一致
+    """
+    return hashlib.blake2b(data, digest_size=8).digest()
+
+
+def _open_smtp_connection(smtp_settings: Mapping[str, Any], timeout: float):
+    """
+    建立新的 SMTP 连接并完成认证，失败时关闭已打开的连接
+    """
+    import smtplib
+    host, port = smtp_settings["host"], smtp_settings["port"]
+    if smtp_settings["encryption"] == "ssl":
+        server = smtplib.SMTP_SSL(host, port, timeout=timeout)
+    else:
+        server = smtplib.SMTP(host, port, timeout=timeout)
+    try:
+        if smtp_settings["encryption"] == "tls":
+            server.starttls()
+        # login 前 smtplib 会按需自动发送 EHLO，使用本机名称而非服务器地址
+        server.login(smtp_settings["mail"], smtp_settings["password"])
+    except Exception:
+        server.close()
+        raise
+    return server
+
+
+def _reset_session(server):
+    """
+    重置会话，与 sendmail 一样忽略连接已断开的错误，保留原本的异常
+    """
+    import smtplib
+    try:
+        server.rset()
+    except smtplib.SMTPServerDisconnected:
+        pass
+
+
+def _pipelined_sendmail(server, from_addr: str, to_addrs: Sequence[str], msg: bytes) -> dict:
+    """
+    服务器支持 PIPELINING 时，一次性发出 MAIL FROM 与全部 RCPT TO 后再统一读取响应，
+    不支持时退回 sendmail，返回值与异常均与 sendmail 一致
+    """
+    import smtplib
+    server.ehlo_or_helo_if_needed()
+    if not server.has_extn("pipelining"):
+        return server.sendmail(from_addr, to_addrs, msg)
+    size = f" size={len(msg)}" if server.has_extn("size") else ""
+    commands = [f"mail FROM:{smtplib.quoteaddr(from_addr)}{size}"]
+    commands.extend(f"rcpt TO:{smtplib.quoteaddr(addr)}" for addr in to_addrs)
+    server.send("".join(f"{command}\r\n" for command in commands))
+    # 必须读完所有响应，连接才能继续使用
+    replies = [server.getreply() for _ in commands]
+    code, resp = replies[0]
+    if code != 250:
+        if code == 421:
+            server.close()
+        else:
+            _reset_session(server)
+        raise smtplib.SMTPSenderRefused(code, resp, from_addr)
+    refused = {addr: reply for addr, reply in zip(to_addrs, replies[1:]) if reply[0] not in (250, 251)}
+    # 服务器返回 421 表示即将关闭连接，与 sendmail 一样关闭连接并汇报拒收
+    if any(reply[0] == 421 for reply in replies[1:]):
+        server.close()
+        raise smtplib.SMTPRecipientsRefused(refused)
+    if len(refused) == len(to_addrs):
+        _reset_session(server)
+        raise smtplib.SMTPRecipientsRefused(refused)
+    code, resp = server.data(msg)
+    if code != 250:
+        if code == 421:
+            server.close()
+        else:
+            _reset_session(server)
+        raise smtplib.SMTPDataError(code, resp)
+    return refused
+
+
+@lru_cache(maxsize=4)
+def _compiled_template(path: str, mtime_ns: int) -> SmtpMsgTemplate:
+    """
+    读取并缓存模板，文件修改时间变化后重新加载
+    """
+    return SmtpMsgTemplate(Path(path).read_bytes().decode("utf-8"))
+
+
+@lru_cache(maxsize=32)
+def _render_cached_template(path: str, mtime_ns: int, text, image, title, userid, msg_type) -> str:
+    """
+    缓存渲染结果，主服务器失败后由备用服务器重发同一条消息时不再重复渲染
+    """
+    return _compiled_template(path, mtime_ns).render(text=text, image=image, title=title, userid=userid,
+                                                     msg_type=msg_type)
+
+
+def _render_template(path: str, mtime_ns: int, text, image, title, userid, msg_type) -> str:
+    """
+    渲染模板，参数无法作为缓存键（如 bytearray 图片）时不使用缓存
+    """
+    try:
+        hash((text, image, title, userid, msg_type))
+    except TypeError:
+        return _compiled_template(path, mtime_ns).render(text=text, image=image, title=title, userid=userid,
+                                                         msg_type=msg_type)
+    return _render_cached_template(path, mtime_ns, text, image, title, userid, msg_type)
+
+
+@lru_cache(maxsize=8)
+def _read_cached_image_file(path: str, mtime_ns: int) -> bytes:
+    """
+    读取并缓存本地图片，文件修改时间变化后重新读取
+    """
+    return Path(path).read_bytes()
+
+
+def _read_image_file(image_path: Path) -> bytes:
+    """
+    读取本地图片，超过缓存大小上限的图片直接读取，不占用缓存
+    """
+    stat = image_path.stat()
+    if stat.st_size > _IMAGE_CACHE_MAX_BYTES:
+        return image_path.read_bytes()
+    return _read_cached_image_file(str(image_path), stat.st_mtime_ns)
+
+
+@lru_cache(maxsize=8)
+def _encode_cached_image(image_data: bytes) -> str:
+    """
+    按图片内容缓存 base64 编码结果
+    """
+    return base64.encodebytes(image_data).decode("ascii")
+
+
+def _encode_image(image_data: bytes) -> str:
+    """
+    base64 编码图片，超过缓存大小上限的图片直接编码，不占用缓存
+    """
+    if len(image_data) > _IMAGE_CACHE_MAX_BYTES:
+        return base64.encodebytes(image_data).decode("ascii")
+    return _encode_cached_image(image_data)
+
+
+def _image_subtype(image_data: bytes) -> str:
+    """
+    按文件头判断图片的 MIME 子类型
+    """
+    for signature, subtype in _IMAGE_SIGNATURES:
+        if image_data.startswith(signature):
+            return subtype
+    if image_data[:4] == b'RIFF' and image_data[8:12] == b'WEBP':
+        return 'webp'
+    raise Exception("无法识别的图片格式")
+
+
+def _build_image_part(image_data: bytes):
+    """
+    构建内嵌图片段，复用已缓存的 base64 编码
+    """
+    from email.message import MIMEPart
+    image_part = MIMEPart()
+    image_part['Content-Type'] = f'image/{_image_subtype(image_data)}'
+    image_part['Content-Transfer-Encoding'] = 'base64'
+    image_part['Content-Disposition'] = 'inline'
+    image_part['Content-ID'] = '<image>'
+    image_part.set_payload(_encode_image(image_data))
+    return image_part
+
+
+# 消息类型选项
+_MSG_TYPE_OPTIONS: List[dict] = [{"title": item.value, "value": item.name} for item in NotificationType]
+
+
+def _row(*content) -> dict:
+    """
+    表单行，内容垂直居中
+    """
+    return {
+        'component': 'VRow',
+        'props': {
+            'align': 'center',
+        },
+        'content': list(content),
+    }
+
+
+def _col(md: Optional[int], *content, cols: int = 12) -> dict:
+    """
+    表单列，md 为空时占满整行
+    """
+    props = {'cols': cols}
+    if md is not None:
+        props['md'] = md
+    return {
+        'component': 'VCol',
+        'props': props,
+        'content': list(content),
+    }
+
+
+def _switch(model: str, label: str, hint: str) -> dict:
+    """
+    开关
+    """
+    return {
+        'component': 'VSwitch',
+        'props': {
+            'model': model,
+            'label': label,
+            'hint': hint,
+            'persistent-hint': True,
+        }
+    }
+
+
+def _text_field(model: str, label: str, placeholder: str, hint: str, clearable: bool = True, **props) -> dict:
+    """
+    输入框，props 为额外属性
+    """
+    props.update({
+        'model': model,
+        'label': label,
+        'placeholder': placeholder,
+        'hint': hint,
+        'persistent-hint': True,
+    })
+    if clearable:
+        props['clearable'] = True
+    return {
+        'component': 'VTextField',
+        'props': props,
+    }
+
+
+def _select(model: str, label: str, items: Sequence[Mapping[str, Any]], hint: str) -> dict:
+    """
+    下拉选择框
+    """
+    return {
+        'component': 'VSelect',
+        'props': {
+            'model': model,
+            'label': label,
+            'items': items,
+            'hint': hint,
+            'persistent-hint': True,
+        }
+    }
+
+
+def _alert(text: str, alert_type: str = 'info', **props) -> dict:
+    """
+    提示信息，props 为额外属性
+    """
+    props.update({
+        'type': alert_type,
+        'variant': 'tonal',
+        'text': text,
+    })
+    return {
+        'component': 'VAlert',
+        'props': props,
+    }
+
+
+def _tab(value: str, text: str) -> dict:
+    """
+    标签页按钮
+    """
+    return {
+        'component': 'VTab',
+        'props': {
+            'value': value,
+            'style': {
+                'padding-top': '10px',
+                'padding-bottom': '10px',
+                'font-size': '16px'
+            },
+        },
+        'text': text
+    }
+
+
+def _window_item(value: str, *content) -> dict:
+    """
+    标签页内容
+    """
+    return {
+        'component': 'VWindowItem',
+        'props': {
+            'value': value,
+            'style': {
+                'padding-top': '20px',
+                'padding-bottom': '20px'
+            },
+        },
+        'content': list(content),
+    }
+
+
+def _shared_key(value):
+    """
+    节点的去重键，子节点已去重，直接使用其 id
+    """
+    if isinstance(value, (dict, list)):
+        return id(value)
+    return type(value), value
+
+
+def _share(node):
+    """
+    配置页面中结构相同的节点共用同一对象，结果仍为普通的字典与列表，调用方不应修改
+    """
+    if isinstance(node, dict):
+        shared = {key: _share(value) for key, value in node.items()}
+        key = (dict,) + tuple((name, _shared_key(value)) for name, value in shared.items())
+        return _shared_nodes.setdefault(key, shared)
+    if isinstance(node, list):
+        shared = [_share(value) for value in node]
+        key = (list,) + tuple(_shared_key(value) for value in shared)
+        return _shared_nodes.setdefault(key, shared)
+    return node
+
+
+# 加密方式选项，主备服务器共用
+_ENCRYPTION_OPTIONS: List[Dict[str, str]] = _share([
+    {'title': '不加密', 'value': 'not_encrypted'},
+    {'title': 'SSL', 'value': 'ssl'},
+    {'title': 'TLS', 'value': 'tls'},
+])
+
+
+@lru_cache(maxsize=1)
+def _page_main_smtp() -> dict:
+    """
+    主SMTP服务器设置页
+    """
+    return _share(_window_item(
+        'main_smtp',
+        {
+            'component': 'VForm',
+            'content': [
+                _row(
+                    _col(3, _switch('main', '启用主服务器', '允许使用主服务器发送消息')),
+                    _col(9, _alert('主服务器发送成功时，不使用备用服务器发送消息（两个服务器至少启用一个）')),
+                ),
+                _row(
+                    _col(6, _text_field('main_smtp_host', 'SMTP服务器地址', 'smtp.example.com',
+                                        '服务器的地址，不需要加任何协议头')),
+                    _col(4, _text_field('main_smtp_port', 'SMTP服务器端口', '常见：25、465、587、995……',
+                                        '服务器地址的端口号：1~65535', maxlength=5, type='number')),
+                    _col(2, _select('main_smtp_encryption', '加密方式', _ENCRYPTION_OPTIONS,
+                                    '服务器的加密方式')),
+                ),
+                _row(
+                    _col(6, _text_field('main_sender_mail', 'SMTP邮箱账号', 'example@example.com',
+                                        '登录时使用的邮箱账号，一般为完整的邮箱地址')),
+                    _col(6, _text_field('main_sender_password', 'SMTP邮箱密码/Token', 'Passwd or Token',
+                                        '邮箱账号的密码，或者从服务器获取到的token值')),
+                ),
+            ]
+        }
+    ))
+
+
+@lru_cache(maxsize=1)
+def _page_secondary_smtp() -> dict:
+    """
+    备用SMTP服务器设置页
+    """
+    return _share(_window_item(
+        'secondary_smtp',
+        _row(
+            _col(3, _switch('secondary', '启用备用服务器', '允许启用备用服务器发送消息')),
+            _col(9, _alert('主服务器发送失败时，会使用备用服务器发送消息（两个服务器至少启用一个）')),
+        ),
+        _row(
+            _col(6, _text_field('secondary_smtp_host', '备用SMTP服务器地址', 'smtp.example.com',
+                                '服务器的地址，不需要加任何协议头')),
+            _col(4, _text_field('secondary_smtp_port', '备用SMTP服务器端口', '常见：25、465、587、995',
+                                '服务器地址的端口号：1~65535', maxlength=5, type='number')),
+            _col(2, _select('secondary_smtp_encryption', '加密方式', _ENCRYPTION_OPTIONS,
+                            '服务器的加密方式')),
+        ),
+        _row(
+            _col(6, _text_field('secondary_sender_mail', '备用SMTP邮箱账号', 'example@example.com',
+                                '登录时使用的邮箱账号，一般为完整的邮箱地址')),
+            _col(6, _text_field('secondary_sender_password', '备用SMTP邮箱密码/Token', 'Passwd or Token',
+                                '邮箱账号的密码，或者从服务器获取到的token值')),
+        ),
+    ))
+
+
+@lru_cache(maxsize=1)
+def _page_email_setting() -> dict:
+    """
+    邮件设置页
+    """
+    return _share(_window_item(
+        'email_setting',
+        _row(
+            _col(3, _switch('enabled_image_send', '发送图片', '嵌入图片到邮件模板中')),
+            _col(3, _switch('enabled_proxy_image', '全局代理获取图片', '使用代理服务器获取图片数据')),
+            _col(3, _switch('enabled_github_proxy_image', 'Github加速站代理', '用Github加速站获取图片数据')),
+            _col(3, _text_field('image_timeout', '获取图片超时时间（秒）', '10', '获取图片的超时时间，默认10秒',
+                                type='number')),
+        ),
+        _row(
+            _col(12, _alert('同时启用全局与Github加速站时，'
+                            'Github官方域名的URL会优先使用加速站获取，'
+                            '失败时自动使用全局代理再次获取。\n'
+                            '\n'
+                            'Github加速站代理功能，只代理Github官方的域名的URL，'
+                            '此功能依赖于 "GITHUB_PROXY" 变量。\n'
+                            '\n'
+                            '非Github官方域名的URL，不使用Github加速站代理，'
+                            '而是直接使用全局代理，此功能依赖于 "PROXY_HOST" 变量。',
+                            alert_type='warning', style='white-space: pre-line;')),
+        ),
+        _row(
+            _col(6, _text_field('sender_name', '发件人用户名', 'MovePilot',
+                                '不输入时，默认使用发件人邮箱作为发件人用户名')),
+            _col(6, _text_field('receiver_mail', '收件人邮箱', 'test1@example.com,test2@example.com',
+                                '默认发送至发件人地址，多个邮箱用英文逗号","分割', clearable=False)),
+        ),
+        _row(
+            _col(None, {
+                'component': 'VAutocomplete',
+                'props': {
+                    'multiple': True,
+                    'chips': True,
+                    'model': 'msgtypes',
+                    'label': '消息类型',
+                    'items': _MSG_TYPE_OPTIONS,
+                    'clearable': True,
+                    'hint': '自定义需要接受并发送的消息类型',
+                    'persistent-hint': True,
+                }
+            }),
+        ),
+    ))
+
+
+@lru_cache(maxsize=1)
+def _page_custom_template() -> dict:
+    """
+    自定义邮件模板设置页
+    """
+    return _share(_window_item(
+        'custom_template',
+        _row(
+            _col(3, _switch('enabled_customizable_mail_template', '启用自定义模板',
+                            '开启后自定义模板将处于激活状态')),
+            _col(9, _alert('开启"写入自定义模板"后，"恢复默认模板"不会生效！配置在写入后才会生效！',
+                           alert_type='warning')),
+        ),
+        _row(
+            _col(3, _switch('save', '写入自定义模板', '将配置写入到config路径的文件里')),
+            _col(3, _switch('reset', '恢复默认模板', '恢复模板，会覆盖当前的自定义模板')),
+            _col(6, _alert('重置插件不会重置自定义模板配置，请放心使用！')),
+        ),
+        _row(
+            _col(None, {
+                'component': 'VAceEditor',
+                'props': {
+                    'modelvalue': 'content',
+                    'lang': 'html',
+                    'theme': 'monokai',
+                    'style': 'height: 20rem; font-size: 14px;',
+                }
+            }),
+        ),
+        _row(
+            _col(None, _alert('支持的变量：'
+                              '类型：{msg_type}、用户ID：{userid}、标题：{title}、'
+                              '内容：{text}、图片：cid:image\n'
+                              '\n'
+                              '电脑端可用 "ctrl" + "/" '
+                              '快捷键来快速打开/关闭需要注释的内容。',
+                              style='white-space: pre-line;')),
+        ),
+    ))
+
+
+@lru_cache(maxsize=1)
+def _page_log_setting() -> dict:
+    """
+    日志设置页
+    """
+    return _share(_window_item(
+        'log_setting',
+        _row(
+            _col(3, _switch('log_more', '记录更多日志', '记录细节，排查问题')),
+        ),
+        _row(
+            _col(3, _switch('clean_all_log', '立刻清空所有日志', '一次性任务，运行后自动关闭')),
+            _col(3, _switch('onlyonce_clean', '立刻整理日志', '一次性任务，依赖于日志记录最大数量')),
+            _col(3, _switch('enabled_max_lines', '启用最大记录数量', '激活日志记录最大数量')),
+            _col(3, _text_field('max_lines', '日志记录最大数量', '不能低于等于0', '保存的最近的记录的最大数量',
+                                type='number')),
+        ),
+        _row(
+            _col(None, _alert('启用最大记录数量后，每次发送任务结束，不管是否发送成功，'
+                              '都将进行整理，该功能处理方式为删除文件内记录！\n'
+                              '\n'
+                              '清空所有日志记录功能不需要依赖于启用最大记录数量。\n'
+                              '\n'
+                              '同时启用立刻清空所有日志与立刻整理日志时，'
+                              '优先运行立刻整理日志，且自动关闭清空所有日志开关，'
+                              '避免误操作！',
+                              style='white-space: pre-line;')),
+        ),
+    ))
+
+
+# 插件配置页面
+@lru_cache(maxsize=1)
+def _build_form_schema() -> List[dict]:
+    """
+    构建插件配置页面，首次打开配置页时构建并缓存，各次调用共用同一结构
+    """
+    return _share([
+        {
+            'component': 'VForm',
+            'content': [
+                _row(
+                    _col(3, _switch('enabled', '启用插件', '开启后插件将处于激活状态')),
+                    _col(6, _switch('test', '发送测试邮件', '发送测试邮件，检查配置是否正确')),
+                    _col(3, _text_field('server_timeout', '超时时间（秒）', '10', '连接时的超时时间，默认10秒',
+                                        type='number')),
+                ),
+                {
+                    'component': 'VTabs',
+                    'props': {
+                        'model': '_tabs',
+                        'height': 72,
+                        'style': {
+                            'margin-top': '8px',
+                            'margin-bottom': '10px',
+                        }
+                    },
+                    'content': [
+                        _tab('main_smtp', '主SMTP服务器'),
+                        _tab('secondary_smtp', '备用SMTP服务器'),
+                        _tab('email_setting', '邮件设置'),
+                        _tab('custom_template', '自定义邮件模板'),
+                        _tab('log_setting', '日志设置'),
+                    ]
+                },
+                {
+                    'component': 'VWindow',
+                    'props': {
+                        'model': '_tabs',
+                    },
+                    'content': [
+                        _page_main_smtp(),
+                        _page_secondary_smtp(),
+                        _page_email_setting(),
+                        _page_custom_template(),
+                        _page_log_setting(),
+                    ]
+                }
+            ]
+        }
+    ])
+
+
 class SmtpMsg(_PluginBase):
     # 插件名称
     plugin_name = "SMTP邮件消息通知"
@@ -121,7 +1011,7 @@ class SmtpMsg(_PluginBase):
     # 插件图标
     plugin_icon = "Synomail_A.png"
     # 插件版本
-    plugin_version = "3.0"
+    plugin_version = "3.1"
     # 插件作者
     plugin_author = "Aqr-K"
     # 作者主页
@@ -134,19 +1024,22 @@ class SmtpMsg(_PluginBase):
     auth_level = 1
 
     # 配置文件路径
-    default_template: Path = settings.CONFIG_PATH / ".." / "app" / "plugins" / "smtpmsg" / "template" / "default.html"
+    default_template: Path = Path(__file__).resolve().parent / "template" / "default.html"
     # 新版目录
     # new_custom_template_dir: Path = settings.PLUGIN_DATA_PATH / "SmtpMsg" / "template"
     # 旧版目录
     custom_template_dir: Path = settings.PLUGIN_DATA_PATH / "smtpmsg" / "template"
     custom_template: Path = custom_template_dir / "custom.html"
-    _test_image: Path = settings.CONFIG_PATH / ".." / "app" / "plugins" / "smtpmsg" / "Synomail_A.png"
+    _test_image: Path = Path(__file__).resolve().parent / "Synomail_A.png"
     log_path: Path = settings.LOG_PATH / "plugins" / "smtpmsg.log"
 
     # 私有属性
     _enabled: bool = False
     _test: bool = False
     _server_timeout: Union[float, int, None] = 10
+    # 初始化时解析好的连接与获取图片超时时间（秒）
+    _connect_timeout: float = _DEFAULT_TIMEOUT
+    _fetch_timeout: float = _DEFAULT_TIMEOUT
 
     _main: bool = True
     _main_smtp_host: Optional[str] = None
@@ -168,13 +1061,22 @@ class SmtpMsg(_PluginBase):
     _image_timeout: Union[float, int, None] = 10
     _sender_name: Optional[str] = None
     _receiver_mail: Optional[str] = None
+    # 初始化时解析的收件人列表，为空时发送至发件人地址
+    _receiver_list: Tuple[str, ...] = ()
     _msgtypes: List[str] = []
+    # 初始化时生成的消息类型集合，用于发送时快速判断
+    _msgtype_set: frozenset = frozenset()
+    # 初始化时整合的主备服务器配置
+    _smtp_settings: Dict[str, Mapping[str, Any]] = {}
     _other_msgtypes: bool = False
 
     _enabled_customizable_mail_template: bool = False
     _save: bool = False
     _reset: bool = False
     _content = ""
+    _template_cache: Optional[Tuple[int, str, bytes]] = None
+    _content_hash: Optional[Tuple[str, bytes]] = None
+    _config_dirty: bool = False
 
     _enabled_msg_rules: bool = False
     _enabled_customizable_msg_rules: bool = False
@@ -185,109 +1087,141 @@ class SmtpMsg(_PluginBase):
     _enabled_max_lines: bool = False
     _max_lines: Optional[int] = 100
 
-    _scheduler: Optional[BackgroundScheduler] = BackgroundScheduler(timezone=settings.TZ)
+    # 配置项默认值（content 单独处理）
+    _config_defaults: Dict[str, Any] = {
+        'enabled': False,
+        'test': False,
+        'server_timeout': None,
+
+        'main': True,
+        'main_smtp_host': None,
+        'main_smtp_port': None,
+        'main_smtp_encryption': "not_encrypted",
+        'main_sender_mail': None,
+        'main_sender_password': None,
+
+        'secondary': False,
+        'secondary_smtp_host': None,
+        'secondary_smtp_port': None,
+        'secondary_smtp_encryption': "not_encrypted",
+        'secondary_sender_mail': None,
+        'secondary_sender_password': None,
+
+        'enabled_image_send': False,
+        'enabled_proxy_image': True,
+        'enabled_github_proxy_image': True,
+        'image_timeout': None,
+        'sender_name': None,
+        'receiver_mail': "",
+        'msgtypes': [],
+        'other_msgtypes': False,
+
+        'enabled_customizable_mail_template': False,
+        'save': False,
+        'reset': False,
+
+        'enabled_msg_rules': False,
+        'enabled_customizable_msg_rules': False,
+
+        'log_more': False,
+        'clean_all_log': False,
+        'onlyonce_clean': False,
+        'enabled_max_lines': False,
+        'max_lines': 100,
+    }
+    # 配置页面默认值（content 在打开配置页时读取）
+    _form_defaults: Dict[str, Any] = {
+        'enabled': False,
+        'test': False,
+
+        'server_timeout': 10,
+
+        'main': True,
+        'main_smtp_host': "",
+        'main_smtp_port': "",
+        'main_smtp_encryption': "not_encrypted",
+        'main_sender_mail': "",
+        'main_sender_password': "",
+
+        'secondary': False,
+        'secondary_smtp_host': "",
+        'secondary_smtp_port': "",
+        'secondary_smtp_encryption': "not_encrypted",
+        'secondary_sender_mail': "",
+        'secondary_sender_password': "",
+
+        'enabled_image_send': False,
+        'enabled_proxy_image': True,
+        'enabled_github_proxy_image': True,
+        'image_timeout': 10,
+        'sender_name': "",
+        'receiver_mail': "",
+        'msgtypes': [],
+        'other_msgtypes': False,
+
+        'enabled_customizable_mail_template': False,
+        'save': False,
+        'reset': False,
+
+        'enabled_msg_rules': False,
+        'enabled_customizable_msg_rules': False,
+
+        'log_more': False,
+        'clean_all_log': False,
+        'onlyonce_clean': False,
+        'enabled_scheduled_clean': False,
+        'cron': '0 0 7 * * ',
+        'rows': 100,
+    }
+    # 配置项对应的私有属性
+    _config_attrs: Dict[str, str] = {key: f"_{key}" for key in _config_defaults}
+    _config_attrs['enabled_image_send'] = "_send_image"
+
+    _scheduler: Optional[BackgroundScheduler] = None
     _event = threading.Event()
+    # 按服务器划分的发送队列：0 为主服务器，1 为备用服务器
+    _queues: Optional[Dict[int, queue.Queue]] = None
 
     def init_plugin(self, config: dict = None):
         """
         初始化插件
         """
         logger.info(f"日志汇报 - 初始化插件 - {self.plugin_name}")
+        # 重新加载时宿主不一定先调用 stop_service，停止旧的发送线程，按新配置重建
+        self._stop_queue()
+        # 关闭空闲连接，测试邮件与之后的发送都按新配置重新登录
+        SmtpMsgConnectionPool.close_all()
         # 读取配置
         if config:
-            self._enabled = config.get("enabled", False)
-            self._test = config.get("test", False)
-            self._server_timeout = config.get("server_timeout")
-
-            self._main = config.get("main", True)
-            self._main_smtp_host = config.get("main_smtp_host", )
-            self._main_smtp_port = config.get("main_smtp_port", )
-            self._main_smtp_encryption = config.get("main_smtp_encryption", "not_encrypted")
-            self._main_sender_mail = config.get("main_sender_mail", )
-            self._main_sender_password = config.get("main_sender_password", )
-
-            self._secondary = config.get("secondary", False)
-            self._secondary_smtp_host = config.get("secondary_smtp_host", )
-            self._secondary_smtp_port = config.get("secondary_smtp_port", )
-            self._secondary_smtp_encryption = config.get("secondary_smtp_encryption", "not_encrypted")
-            self._secondary_sender_mail = config.get("secondary_sender_mail", )
-            self._secondary_sender_password = config.get("secondary_sender_password", )
-
-            self._send_image = config.get("enabled_image_send", False)
-            self._enabled_proxy_image = config.get("enabled_proxy_image", True)
-            self._enabled_github_proxy_image = config.get("enabled_github_proxy_image", True)
-            self._image_timeout = config.get("image_timeout")
-            self._sender_name = config.get("sender_name", )
-            self._receiver_mail = config.get("receiver_mail", "")
-            self._msgtypes = config.get("msgtypes", [])
-            self._other_msgtypes = config.get("other_msgtypes", False)
-
-            self._enabled_customizable_mail_template = config.get("enabled_customizable_mail_template", False)
-            self._save = config.get("save", False)
-            self._reset = config.get("reset", False)
-            self._content = config.get("content", self.custom_template.read_text(encoding="utf-8"))
-
-            self._enabled_msg_rules = config.get("enabled_msg_rules", False)
-            self._enabled_customizable_msg_rules = config.get("enabled_customizable_msg_rules", False)
-
-            self._log_more = config.get("log_more", False)
-            self._clean_all_log = config.get("clean_all_log", False)
-            self._onlyonce_clean = config.get("onlyonce_clean", False)
-            self._enabled_max_lines = config.get("enabled_max_lines", False)
-            self._max_lines = config.get("max_lines", 100)
+            for key, attr in self._config_attrs.items():
+                setattr(self, attr, config.get(key, self._config_defaults[key]))
+            self._content = config["content"] if "content" in config else self._read_template()
+        self._connect_timeout = _parse_timeout(self._server_timeout)
+        self._fetch_timeout = _parse_timeout(self._image_timeout)
+        self._msgtype_set = frozenset(self._msgtypes or ())
+        self._receiver_list = tuple(mail for mail in _RECEIVER_SPLIT_RE.split(str(self._receiver_mail or "").strip())
+                                    if mail)
+        self._smtp_settings = self.__smtp_settings()
         SmtpMsgDecorator.set(max_lines=self._max_lines, log_more=self._log_more,
                              log_path=self.log_path, enabled_max_lines=self._enabled_max_lines)
-        self._check_path()
-        self._template_settings()
-        self._run_plugin()
-        self._onlyonce_clean_logs()
+        self._config_dirty = False
+        try:
+            self._check_path()
+            self._template_settings()
+            self._run_plugin()
+            self._onlyonce_clean_logs()
+        finally:
+            # 初始化过程中的配置变更统一保存一次
+            if self._config_dirty:
+                self.__update_config()
+                self._config_dirty = False
 
     def __update_config(self):
         """
         配置更新
         """
-        config = {
-            'enabled': self._enabled,
-            'test': self._test,
-            'server_timeout': self._server_timeout,
-
-            'main': self._main,
-            'main_smtp_host': self._main_smtp_host,
-            'main_smtp_port': self._main_smtp_port,
-            'main_smtp_encryption': self._main_smtp_encryption,
-            'main_sender_mail': self._main_sender_mail,
-            'main_sender_password': self._main_sender_password,
-
-            'secondary': self._secondary,
-            'secondary_smtp_host': self._secondary_smtp_host,
-            'secondary_smtp_port': self._secondary_smtp_port,
-            'secondary_smtp_encryption': self._secondary_smtp_encryption,
-            'secondary_sender_mail': self._secondary_sender_mail,
-            'secondary_sender_password': self._secondary_sender_password,
-
-            'enabled_image_send': self._send_image,
-            'enabled_proxy_image': self._enabled_proxy_image,
-            'enabled_github_proxy_image': self._enabled_github_proxy_image,
-            'image_timeout': self._image_timeout,
-            'sender_name': self._sender_name,
-            'receiver_mail': self._receiver_mail,
-            'msgtypes': self._msgtypes,
-            'other_msgtypes': self._other_msgtypes,
-
-            'enabled_customizable_mail_template': self._enabled_customizable_mail_template,
-            'save': self._save,
-            'reset': self._reset,
-            'content': self.custom_template.read_text(encoding="utf-8"),
-
-            'enabled_msg_rules': self._enabled_msg_rules,
-            'enabled_customizable_msg_rules': self._enabled_customizable_msg_rules,
-
-            'log_more': self._log_more,
-            'clean_all_log': self._clean_all_log,
-            'onlyonce_clean': self._onlyonce_clean,
-            'max_lines': self._max_lines,
-            'enabled_max_lines': self._enabled_max_lines,
-        }
+        config = {key: getattr(self, attr) for key, attr in self._config_attrs.items()}
+        config['content'] = self._read_template()
         self.update_config(config)
 
     def get_state(self) -> bool:
@@ -301,1459 +1235,7 @@ class SmtpMsg(_PluginBase):
         pass
 
     def get_form(self) -> Tuple[List[dict], Dict[str, Any]]:
-        MsgTypeOptions = []
-        for item in NotificationType:
-            MsgTypeOptions.append({
-                "title": item.value,
-                "value": item.name
-            })
-
-        # Todo: 消息过滤使用，获取插件列表
-        # plugin_manager = PluginManager()
-        # local_plugins = plugin_manager.get_local_plugins()
-        # PluginTypeOptions = []
-        #
-        # for index, local_plugin in enumerate(local_plugins, start=1):
-        #     PluginTypeOptions.append({
-        #         "title": f"{local_plugin.plugin_name}",
-        #         "value": local_plugin.id
-        #     })
-
-        return [
-            {
-                'component': 'VForm',
-                'content': [
-                    {
-                        'component': 'VRow',
-                        'props': {
-                            'align': 'center',
-                        },
-                        'content': [
-                            {
-                                'component': 'VCol',
-                                'props': {
-                                    'cols': 12,
-                                    'md': 3,
-                                },
-                                'content': [
-                                    {
-                                        'component': 'VSwitch',
-                                        'props': {
-                                            'model': 'enabled',
-                                            'label': '启用插件',
-                                            'hint': '开启后插件将处于激活状态',
-                                            'persistent-hint': True,
-                                        }
-                                    }
-                                ]
-                            },
-                            {
-                                'component': 'VCol',
-                                'props': {
-                                    'cols': 12,
-                                    'md': 6,
-                                },
-                                'content': [
-                                    {
-                                        'component': 'VSwitch',
-                                        'props': {
-                                            'model': 'test',
-                                            'label': '发送测试邮件',
-                                            'hint': '发送测试邮件，检查配置是否正确',
-                                            'persistent-hint': True,
-                                        }
-                                    }
-                                ]
-                            },
-                            {
-                                'component': 'VCol',
-                                'props': {
-                                    'cols': '12',
-                                    'md': 3,
-                                },
-                                'content': [
-                                    {
-                                        'component': 'VTextField',
-                                        'props': {
-                                            'model': 'server_timeout',
-                                            'label': '超时时间（秒）',
-                                            'placeholder': '10',
-                                            'hint': '连接时的超时时间，默认10秒',
-                                            'persistent-hint': True,
-                                            # 'suffix': '秒',
-                                            'clearable': True,
-                                            'type': 'number',
-                                        }
-                                    }
-                                ]
-                            },
-                        ]
-                    },
-                    {
-                        'component': 'VTabs',
-                        'props': {
-                            'model': '_tabs',
-                            'height': 72,
-                            'style': {
-                                'margin-top': '8px',
-                                'margin-bottom': '10px',
-                            }
-                        },
-                        'content': [
-                            {
-                                'component': 'VTab',
-                                'props': {
-                                    'value': 'main_smtp',
-                                    'style': {
-                                        'padding-top': '10px',
-                                        'padding-bottom': '10px',
-                                        'font-size': '16px'
-                                    },
-                                },
-                                'text': '主SMTP服务器'
-                            },
-                            {
-                                'component': 'VTab',
-                                'props': {
-                                    'value': 'secondary_smtp',
-                                    'style': {
-                                        'padding-top': '10px',
-                                        'padding-bottom': '10px',
-                                        'font-size': '16px'
-                                    },
-                                },
-                                'text': '备用SMTP服务器'
-                            },
-                            {
-                                'component': 'VTab',
-                                'props': {
-                                    'value': 'email_setting',
-                                    'style': {
-                                        'padding-top': '10px',
-                                        'padding-bottom': '10px',
-                                        'font-size': '16px'
-                                    },
-                                },
-                                'text': '邮件设置'
-                            },
-                            {
-                                'component': 'VTab',
-                                'props': {
-                                    'value': 'custom_template',
-                                    'style': {
-                                        'padding-top': '10px',
-                                        'padding-bottom': '10px',
-                                        'font-size': '16px'
-                                    },
-                                },
-                                'text': '自定义邮件模板'
-                            },
-                            {
-                                'component': 'VTab',
-                                'props': {
-                                    'value': 'log_setting',
-                                    'style': {
-                                        'padding-top': '10px',
-                                        'padding-bottom': '10px',
-                                        'font-size': '16px'
-                                    },
-                                },
-                                'text': '日志设置'
-                            },
-                            # Todo: 未完成，暂时不显示
-                            # {
-                            #     'component': 'VTab',
-                            #     'disabled': "true",
-                            #     'props': {
-                            #         'value': 'msg_rules',
-                            #         'style': {
-                            #             'padding-top': '10px',
-                            #             'padding-bottom': '10px',
-                            #             'font-size': '16px'
-                            #         },
-                            #     },
-                            #     'text': '消息过滤'
-                            # },
-                        ]
-                    },
-                    {
-                        'component': 'VWindow',
-                        'props': {
-                            'model': '_tabs',
-                        },
-                        'content': [
-                            {
-                                'component': 'VWindowItem',
-                                'props': {
-                                    'value': 'main_smtp',
-                                    'style': {
-                                        'padding-top': '20px',
-                                        'padding-bottom': '20px'
-                                    },
-                                },
-                                'content': [
-                                    {
-                                        'component': 'VForm',
-                                        'content': [
-                                            {
-                                                'component': 'VRow',
-                                                'props': {
-                                                    'align': 'center'
-                                                },
-                                                'content': [
-                                                    {
-                                                        'component': 'VCol',
-                                                        'props': {
-                                                            'cols': 12,
-                                                            'md': 3
-                                                        },
-                                                        'content': [
-                                                            {
-                                                                'component': 'VSwitch',
-                                                                'props': {
-                                                                    'model': 'main',
-                                                                    'label': '启用主服务器',
-                                                                    'hint': '允许使用主服务器发送消息',
-                                                                    'persistent-hint': True,
-                                                                }
-                                                            }
-                                                        ]
-                                                    },
-                                                    {
-                                                        'component': 'VCol',
-                                                        'props': {
-                                                            'cols': 12,
-                                                            'md': 9
-                                                        },
-                                                        'content': [
-                                                            {
-                                                                'component': 'VAlert',
-                                                                'props': {
-                                                                    'type': 'info',
-                                                                    'variant': 'tonal',
-                                                                    'text': '主服务器发送成功时，不使用备用服务器发送消息（两个服务器至少启用一个）'
-                                                                }
-                                                            }
-                                                        ]
-                                                    },
-                                                ]
-                                            },
-                                            {
-                                                'component': 'VRow',
-                                                'props': {
-                                                    'align': 'center'
-                                                },
-                                                'content': [
-                                                    {
-                                                        'component': 'VCol',
-                                                        'props': {
-                                                            'cols': '12',
-                                                            'md': 6
-                                                        },
-                                                        'content': [
-                                                            {
-                                                                'component': 'VTextField',
-                                                                'props': {
-                                                                    'model': 'main_smtp_host',
-                                                                    'label': 'SMTP服务器地址',
-                                                                    'placeholder': 'smtp.example.com',
-                                                                    'clearable': True,
-                                                                    'hint': '服务器的地址，不需要加任何协议头',
-                                                                    'persistent-hint': True,
-                                                                }
-                                                            }
-                                                        ]
-                                                    },
-                                                    {
-                                                        'component': 'VCol',
-                                                        'props': {
-                                                            'cols': '12',
-                                                            'md': 4
-                                                        },
-                                                        'content': [
-                                                            {
-                                                                'component': 'VTextField',
-                                                                'props': {
-                                                                    'model': 'main_smtp_port',
-                                                                    'label': 'SMTP服务器端口',
-                                                                    'placeholder': '常见：25、465、587、995……',
-                                                                    'clearable': True,
-                                                                    'hint': '服务器地址的端口号：1~65535',
-                                                                    'persistent-hint': True,
-                                                                    'maxlength': 5,
-                                                                    'type': 'number',
-                                                                }
-                                                            }
-                                                        ]
-                                                    },
-                                                    {
-                                                        'component': 'VCol',
-                                                        'props': {
-                                                            'cols': '12',
-                                                            'md': 2
-                                                        },
-                                                        'content': [
-                                                            {
-                                                                'component': 'VSelect',
-                                                                'props': {
-                                                                    'model': 'main_smtp_encryption',
-                                                                    'label': '加密方式',
-                                                                    'items': [
-                                                                        {'title': '不加密', 'value': 'not_encrypted'},
-                                                                        {'title': 'SSL', 'value': 'ssl'},
-                                                                        {'title': 'TLS', 'value': 'tls'},
-                                                                    ],
-                                                                    'hint': '服务器的加密方式',
-                                                                    'persistent-hint': True,
-                                                                }
-                                                            }
-                                                        ]
-                                                    },
-                                                ]
-                                            },
-                                            {
-                                                'component': 'VRow',
-                                                'props': {
-                                                    'align': 'center'
-                                                },
-                                                'content': [
-                                                    {
-                                                        'component': 'VCol',
-                                                        'props': {
-                                                            'cols': '12',
-                                                            'md': 6
-                                                        },
-                                                        'content': [
-                                                            {
-                                                                'component': 'VTextField',
-                                                                'props': {
-                                                                    'model': 'main_sender_mail',
-                                                                    'label': 'SMTP邮箱账号',
-                                                                    'placeholder': 'example@example.com',
-                                                                    'clearable': True,
-                                                                    'hint': '登录时使用的邮箱账号，一般为完整的邮箱地址',
-                                                                    'persistent-hint': True,
-                                                                }
-                                                            },
-                                                        ]
-                                                    },
-                                                    {
-                                                        'component': 'VCol',
-                                                        'props': {
-                                                            'cols': '12',
-                                                            'md': 6
-                                                        },
-                                                        'content': [
-                                                            {
-                                                                'component': 'VTextField',
-                                                                'props': {
-                                                                    'model': 'main_sender_password',
-                                                                    'label': 'SMTP邮箱密码/Token',
-                                                                    'placeholder': 'Passwd or Token',
-                                                                    'clearable': True,
-                                                                    'hint': '邮箱账号的密码，或者从服务器获取到的token值',
-                                                                    'persistent-hint': True,
-                                                                }
-                                                            },
-                                                        ]
-                                                    },
-                                                ]
-                                            },
-                                        ]
-                                    }
-                                ]
-                            },
-                            {
-                                'component': 'VWindowItem',
-                                'props': {
-                                    'value': 'secondary_smtp',
-                                    'style': {
-                                        'padding-top': '20px',
-                                        'padding-bottom': '20px'
-                                    },
-                                },
-                                'content': [
-                                    {
-                                        'component': 'VRow',
-                                        'props': {
-                                            'align': 'center'
-                                        },
-                                        'content': [
-                                            {
-                                                'component': 'VCol',
-                                                'props': {
-                                                    'cols': 12,
-                                                    'md': 3
-                                                },
-                                                'content': [
-                                                    {
-                                                        'component': 'VSwitch',
-                                                        'props': {
-                                                            'model': 'secondary',
-                                                            'label': '启用备用服务器',
-                                                            'hint': '允许启用备用服务器发送消息',
-                                                            'persistent-hint': True,
-                                                        }
-                                                    }
-                                                ]
-                                            },
-                                            {
-                                                'component': 'VCol',
-                                                'props': {
-                                                    'cols': 12,
-                                                    'md': 9
-                                                },
-                                                'content': [
-                                                    {
-                                                        'component': 'VAlert',
-                                                        'props': {
-                                                            'type': 'info',
-                                                            'variant': 'tonal',
-                                                            'text': '主服务器发送失败时，会使用备用服务器发送消息（两个服务器至少启用一个）'
-                                                        }
-                                                    }
-                                                ]
-                                            },
-                                        ]
-                                    },
-                                    {
-                                        'component': 'VRow',
-                                        'props': {
-                                            'align': 'center'
-                                        },
-                                        'content': [
-                                            {
-                                                'component': 'VCol',
-                                                'props': {
-                                                    'cols': 12,
-                                                    'md': 6
-                                                },
-                                                'content': [
-                                                    {
-                                                        'component': 'VTextField',
-                                                        'props': {
-                                                            'model': 'secondary_smtp_host',
-                                                            'label': '备用SMTP服务器地址',
-                                                            'placeholder': 'smtp.example.com',
-                                                            'clearable': True,
-                                                            'hint': '服务器的地址，不需要加任何协议头',
-                                                            'persistent-hint': True,
-                                                        }
-                                                    }
-                                                ]
-                                            },
-                                            {
-                                                'component': 'VCol',
-                                                'props': {
-                                                    'cols': 12,
-                                                    'md': 4
-                                                },
-                                                'content': [
-                                                    {
-                                                        'component': 'VTextField',
-                                                        'props': {
-                                                            'model': 'secondary_smtp_port',
-                                                            'label': '备用SMTP服务器端口',
-                                                            'placeholder': '常见：25、465、587、995',
-                                                            'clearable': True,
-                                                            'hint': '服务器地址的端口号：1~65535',
-                                                            'persistent-hint': True,
-                                                            'maxlength': 5,
-                                                            'type': 'number',
-                                                        }
-                                                    }
-                                                ]
-                                            },
-                                            {
-                                                'component': 'VCol',
-                                                'props': {
-                                                    'cols': 12,
-                                                    'md': 2
-                                                },
-                                                'content': [
-                                                    {
-                                                        'component': 'VSelect',
-                                                        'props': {
-                                                            'model': 'secondary_smtp_encryption',
-                                                            'label': '加密方式',
-                                                            'items': [{'title': '不加密', 'value': 'not_encrypted'},
-                                                                      {'title': 'SSL', 'value': 'ssl'},
-                                                                      {'title': 'TLS', 'value': 'tls'},
-                                                                      ],
-                                                            'hint': '服务器的加密方式',
-                                                            'persistent-hint': True,
-                                                        }
-                                                    }
-                                                ]
-                                            }
-                                        ]
-                                    },
-                                    {
-                                        'component': 'VRow',
-                                        'props': {
-                                            'align': 'center'
-                                        },
-                                        'content': [
-                                            {
-                                                'component': 'VCol',
-                                                'props': {
-                                                    'cols': 12,
-                                                    'md': 6
-                                                },
-                                                'content': [
-                                                    {
-                                                        'component': 'VTextField',
-                                                        'props': {
-                                                            'model': 'secondary_sender_mail',
-                                                            'label': '备用SMTP邮箱账号',
-                                                            'placeholder': 'example@example.com',
-                                                            'clearable': True,
-                                                            'hint': '登录时使用的邮箱账号，一般为完整的邮箱地址',
-                                                            'persistent-hint': True,
-                                                        }
-                                                    }
-                                                ]
-                                            },
-                                            {
-                                                'component': 'VCol',
-                                                'props': {
-                                                    'cols': 12,
-                                                    'md': 6
-                                                },
-                                                'content': [
-                                                    {
-                                                        'component': 'VTextField',
-                                                        'props': {
-                                                            'model': 'secondary_sender_password',
-                                                            'label': '备用SMTP邮箱密码/Token',
-                                                            'placeholder': 'Passwd or Token',
-                                                            "clearable": True,
-                                                            'hint': '邮箱账号的密码，或者从服务器获取到的token值',
-                                                            'persistent-hint': True,
-                                                        }
-                                                    }
-                                                ]
-                                            }
-                                        ]
-                                    },
-                                ]
-                            },
-                            {
-                                'component': 'VWindowItem',
-                                'props': {
-                                    'value': 'email_setting',
-                                    'style': {
-                                        'padding-top': '20px',
-                                        'padding-bottom': '20px'
-                                    },
-                                },
-                                'content': [
-                                    {
-                                        'component': 'VRow',
-                                        'props': {
-                                            'align': 'center'
-                                        },
-                                        'content': [
-                                            {
-                                                'component': 'VCol',
-                                                'props': {
-                                                    'cols': 12,
-                                                    'md': 3
-                                                },
-                                                'content': [
-                                                    {
-                                                        'component': 'VSwitch',
-                                                        'props': {
-                                                            'model': 'enabled_image_send',
-                                                            'label': '发送图片',
-                                                            'hint': '嵌入图片到邮件模板中',
-                                                            'persistent-hint': True,
-                                                        }
-                                                    }
-                                                ]
-                                            },
-                                            {
-                                                'component': 'VCol',
-                                                'props': {
-                                                    'cols': 12,
-                                                    'md': 3
-                                                },
-                                                'content': [
-                                                    {
-                                                        'component': 'VSwitch',
-                                                        'props': {
-                                                            'model': 'enabled_proxy_image',
-                                                            'label': '全局代理获取图片',
-                                                            'hint': '使用代理服务器获取图片数据',
-                                                            'persistent-hint': True,
-                                                        }
-                                                    }
-                                                ]
-                                            },
-                                            {
-                                                'component': 'VCol',
-                                                'props': {
-                                                    'cols': 12,
-                                                    'md': 3
-                                                },
-                                                'content': [
-                                                    {
-                                                        'component': 'VSwitch',
-                                                        'props': {
-                                                            'model': 'enabled_github_proxy_image',
-                                                            'label': 'Github加速站代理',
-                                                            'hint': '用Github加速站获取图片数据',
-                                                            'persistent-hint': True,
-                                                        }
-                                                    }
-                                                ]
-                                            },
-                                            {
-                                                'component': 'VCol',
-                                                'props': {
-                                                    'cols': 12,
-                                                    'md': 3
-                                                },
-                                                'content': [
-                                                    {
-                                                        'component': 'VTextField',
-                                                        'props': {
-                                                            'model': 'image_timeout',
-                                                            'label': '获取图片超时时间（秒）',
-                                                            'placeholder': '10',
-                                                            'clearable': True,
-                                                            'hint': '获取图片的超时时间，默认10秒',
-                                                            'persistent-hint': True,
-                                                            'type': 'number',
-                                                            # 'suffix': '秒',
-                                                        }
-                                                    }
-                                                ]
-                                            },
-                                        ]
-                                    },
-                                    {
-                                        'component': 'VRow',
-                                        'props': {
-                                            'align': 'center'
-                                        },
-                                        'content': [
-                                            {
-                                                'component': 'VCol',
-                                                'props': {
-                                                    'cols': 12,
-                                                    'md': 12,
-                                                },
-                                                'content': [
-                                                    {
-                                                        'component': 'VAlert',
-                                                        'props': {
-                                                            'type': 'warning',
-                                                            'variant': 'tonal',
-                                                            'text': '同时启用全局与Github加速站时，'
-                                                                    'Github官方域名的URL会优先使用加速站获取，'
-                                                                    '失败时自动使用全局代理再次获取。\n'
-                                                                    '\n'
-                                                                    'Github加速站代理功能，只代理Github官方的域名的URL，'
-                                                                    '此功能依赖于 "GITHUB_PROXY" 变量。\n'
-                                                                    '\n'
-                                                                    '非Github官方域名的URL，不使用Github加速站代理，'
-                                                                    '而是直接使用全局代理，此功能依赖于 "PROXY_HOST" 变量。',
-                                                            'style': 'white-space: pre-line;'
-                                                        }
-                                                    }
-                                                ]
-                                            },
-                                        ]
-                                    },
-                                    {
-                                        'component': 'VRow',
-                                        'props': {
-                                            'align': 'center'
-                                        },
-                                        'content': [
-                                            {
-                                                'component': 'VCol',
-                                                'props': {
-                                                    'cols': 12,
-                                                    'md': 6
-                                                },
-                                                'content': [
-                                                    {
-                                                        'component': 'VTextField',
-                                                        'props': {
-                                                            'model': 'sender_name',
-                                                            'label': '发件人用户名',
-                                                            'placeholder': 'MovePilot',
-                                                            'clearable': True,
-                                                            'hint': '不输入时，默认使用发件人邮箱作为发件人用户名',
-                                                            'persistent-hint': True,
-                                                        }
-                                                    }
-                                                ]
-                                            },
-                                            {
-                                                'component': 'VCol',
-                                                'props': {
-                                                    'cols': 12,
-                                                    'md': 6
-                                                },
-                                                'content': [
-                                                    {
-                                                        'component': 'VTextField',
-                                                        'props': {
-                                                            'model': 'receiver_mail',
-                                                            'label': '收件人邮箱',
-                                                            'placeholder': 'test1@example.com,test2@example.com',
-                                                            'hint': '默认发送至发件人地址，多个邮箱用英文逗号","分割',
-                                                            'persistent-hint': True,
-                                                        }
-                                                    }
-                                                ]
-                                            }
-                                        ]
-                                    },
-                                    {
-                                        'component': 'VRow',
-                                        'props': {
-                                            'align': 'center'
-                                        },
-                                        'content': [
-                                            {
-                                                'component': 'VCol',
-                                                'props': {
-                                                    'cols': 12,
-                                                },
-                                                'content': [
-                                                    {
-                                                        'component': 'VAutocomplete',
-                                                        'props': {
-                                                            'multiple': True,
-                                                            'chips': True,
-                                                            'model': 'msgtypes',
-                                                            'label': '消息类型',
-                                                            'items': MsgTypeOptions,
-                                                            'clearable': True,
-                                                            'hint': '自定义需要接受并发送的消息类型',
-                                                            'persistent-hint': True,
-                                                        }
-                                                    }
-                                                ]
-                                            }
-                                        ]
-                                    },
-                                    # {
-                                    #     'component': 'VRow',
-                                    #     'props': {
-                                    #         'align': 'center'
-                                    #     },
-                                    #     'content': [
-                                    #         {
-                                    #             'component': 'VCol',
-                                    #             'props': {
-                                    #                 'cols': 12,
-                                    #                 'md': 3
-                                    #             },
-                                    #             'content': [
-                                    #                 {
-                                    #                     'component': 'VSwitch',
-                                    #                     'props': {
-                                    #                         'model': 'other_msgtypes',
-                                    #                         'label': '启用第三方消息类型',
-                                    #                     }
-                                    #                 }
-                                    #             ]
-                                    #         },
-                                    #         {
-                                    #             'component': 'VCol',
-                                    #             'props': {
-                                    #                 'cols': 12,
-                                    #                 'md': 9
-                                    #             },
-                                    #             'content': [
-                                    #                 {
-                                    #                     'component': 'VAlert',
-                                    #                     'props': {
-                                    #                         'type': 'info',
-                                    #                         'variant': 'tonal',
-                                    #                         'text': '启用后，允许发送除官方支持的消息类型以外的其他消息类型通知。（一般用于调试）'
-                                    #                     }
-                                    #                 }
-                                    #             ]
-                                    #         },
-                                    #     ]
-                                    # },
-                                ]
-                            },
-                            {
-                                'component': 'VWindowItem',
-                                'props': {
-                                    'value': 'custom_template',
-                                    'style': {
-                                        'padding-top': '20px',
-                                        'padding-bottom': '20px'
-                                    },
-                                },
-                                'content': [
-                                    {
-                                        'component': 'VRow',
-                                        'props': {
-                                            'align': 'center'
-                                        },
-                                        'content': [
-                                            {
-                                                'component': 'VCol',
-                                                'props': {
-                                                    'cols': 12,
-                                                    'md': 3
-                                                },
-                                                'content': [
-                                                    {
-                                                        'component': 'VSwitch',
-                                                        'props': {
-                                                            'model': 'enabled_customizable_mail_template',
-                                                            'label': '启用自定义模板',
-                                                            'hint': '开启后自定义模板将处于激活状态',
-                                                            'persistent-hint': True,
-                                                        }
-                                                    }
-                                                ]
-                                            },
-                                            {
-                                                'component': 'VCol',
-                                                'props': {
-                                                    'cols': 12,
-                                                    'md': 9
-                                                },
-                                                'content': [
-                                                    {
-                                                        'component': 'VAlert',
-                                                        'props': {
-                                                            'type': 'warning',
-                                                            'variant': 'tonal',
-                                                            'text': '开启"写入自定义模板"后，"恢复默认模板"不会生效！配置在写入后才会生效！'
-                                                        }
-                                                    }
-                                                ]
-                                            }
-                                        ]
-                                    },
-                                    {
-                                        'component': 'VRow',
-                                        'props': {
-                                            'align': 'center'
-                                        },
-                                        'content': [
-                                            {
-                                                'component': 'VCol',
-                                                'props': {
-                                                    'cols': 12,
-                                                    'md': 3,
-                                                },
-                                                'content': [
-                                                    {
-                                                        'component': 'VSwitch',
-                                                        'props': {
-                                                            'model': 'save',
-                                                            'label': '写入自定义模板',
-                                                            'hint': '将配置写入到config路径的文件里',
-                                                            'persistent-hint': True,
-                                                        }
-                                                    }
-                                                ]
-                                            },
-                                            {
-                                                'component': 'VCol',
-                                                'props': {
-                                                    'cols': 12,
-                                                    'md': 3,
-                                                },
-                                                'content': [
-                                                    {
-                                                        'component': 'VSwitch',
-                                                        'props': {
-                                                            'model': 'reset',
-                                                            'label': '恢复默认模板',
-                                                            'hint': '恢复模板，会覆盖当前的自定义模板',
-                                                            'persistent-hint': True,
-                                                        }
-                                                    }
-                                                ]
-                                            },
-                                            {
-                                                'component': 'VCol',
-                                                'props': {
-                                                    'cols': 12,
-                                                    'md': 6,
-                                                },
-                                                'content': [
-                                                    {
-                                                        'component': 'VAlert',
-                                                        'props': {
-                                                            'type': 'info',
-                                                            'variant': 'tonal',
-                                                            'text': '重置插件不会重置自定义模板配置，请放心使用！'
-                                                        }
-                                                    }
-                                                ]
-                                            }
-                                        ]
-                                    },
-                                    {
-                                        'component': 'VRow',
-                                        'props': {
-                                            'align': 'center'
-                                        },
-                                        'content': [
-                                            {
-                                                'component': 'VCol',
-                                                'props': {
-                                                    'cols': 12,
-                                                },
-                                                'content': [
-                                                    {
-                                                        'component': 'VAceEditor',
-                                                        'props': {
-                                                            'modelvalue': 'content',
-                                                            'lang': 'html',
-                                                            'theme': 'monokai',
-                                                            'style': 'height: 20rem; font-size: 14px;',
-                                                        }
-                                                    }
-                                                ]
-                                            }
-                                        ]
-                                    },
-                                    {
-                                        'component': 'VRow',
-                                        'props': {
-                                            'align': 'center'
-                                        },
-                                        'content': [
-                                            {
-                                                'component': 'VCol',
-                                                'props': {
-                                                    'cols': 12,
-                                                },
-                                                'content': [
-                                                    {
-                                                        'component': 'VAlert',
-                                                        'props': {
-                                                            'type': 'info',
-                                                            'variant': 'tonal',
-                                                            'style': 'white-space: pre-line;',
-                                                            'text': '支持的变量：'
-                                                                    '类型：{msg_type}、用户ID：{userid}、标题：{title}、'
-                                                                    '内容：{text}、图片：cid:image\n'
-                                                                    '\n'
-                                                                    '电脑端可用 "ctrl" + "/" '
-                                                                    '快捷键来快速打开/关闭需要注释的内容。'
-                                                        }
-                                                    }
-                                                ]
-                                            }
-                                        ]
-                                    },
-                                ]
-                            },
-                            {
-                                'component': 'VWindowItem',
-                                'props': {
-                                    'value': 'log_setting',
-                                    'style': {
-                                        'padding-top': '20px',
-                                        'padding-bottom': '20px'
-                                    },
-                                },
-                                'content': [
-                                    {
-                                        'component': 'VRow',
-                                        'props': {
-                                            'align': 'center'
-                                        },
-                                        'content': [
-                                            {
-                                                'component': 'VCol',
-                                                'props': {
-                                                    'cols': 12,
-                                                    'md': 3,
-                                                },
-                                                'content': [
-                                                    {
-                                                        'component': 'VSwitch',
-                                                        'props': {
-                                                            'model': 'log_more',
-                                                            'label': '记录更多日志',
-                                                            'hint': '记录细节，排查问题',
-                                                            'persistent-hint': True,
-                                                        }
-                                                    }
-                                                ]
-                                            },
-                                        ]
-                                    },
-                                    {
-                                        'component': 'VRow',
-                                        'props': {
-                                            'align': 'center'
-                                        },
-                                        'content': [
-                                            {
-                                                'component': 'VCol',
-                                                'props': {
-                                                    'cols': 12,
-                                                    'md': 3,
-                                                },
-                                                'content': [
-                                                    {
-                                                        'component': 'VSwitch',
-                                                        'props': {
-                                                            'model': 'clean_all_log',
-                                                            'label': '立刻清空所有日志',
-                                                            'hint': '一次性任务，运行后自动关闭',
-                                                            'persistent-hint': True,
-                                                        }
-                                                    }
-                                                ]
-                                            },
-                                            {
-                                                'component': 'VCol',
-                                                'props': {
-                                                    'cols': 12,
-                                                    'md': 3,
-                                                },
-                                                'content': [
-                                                    {
-                                                        'component': 'VSwitch',
-                                                        'props': {
-                                                            'model': 'onlyonce_clean',
-                                                            'label': '立刻整理日志',
-                                                            'hint': '一次性任务，依赖于日志记录最大数量',
-                                                            'persistent-hint': True,
-                                                        }
-                                                    }
-                                                ]
-                                            },
-                                            {
-                                                'component': 'VCol',
-                                                'props': {
-                                                    'cols': 12,
-                                                    'md': 3,
-                                                },
-                                                'content': [
-                                                    {
-                                                        'component': 'VSwitch',
-                                                        'props': {
-                                                            'model': 'enabled_max_lines',
-                                                            'label': '启用最大记录数量',
-                                                            'hint': '激活日志记录最大数量',
-                                                            'persistent-hint': True,
-                                                        }
-                                                    }
-                                                ]
-                                            },
-                                            {
-                                                'component': 'VCol',
-                                                'props': {
-                                                    'cols': 12,
-                                                    'md': 3,
-                                                },
-                                                'content': [
-                                                    {
-                                                        'component': 'VTextField',
-                                                        'props': {
-                                                            'model': 'max_lines',
-                                                            'label': '日志记录最大数量',
-                                                            'placeholder': '不能低于等于0',
-                                                            'hint': '保存的最近的记录的最大数量',
-                                                            'persistent-hint': True,
-                                                            'type': 'number',
-                                                            'clearable': True,
-                                                        }
-                                                    }
-                                                ]
-                                            },
-                                        ]
-                                    },
-                                    {
-                                        'component': 'VRow',
-                                        'props': {
-                                            'align': 'center'
-                                        },
-                                        'content': [
-                                            {
-                                                'component': 'VCol',
-                                                'props': {
-                                                    'cols': 12,
-                                                },
-                                                'content': [
-                                                    {
-                                                        'component': 'VAlert',
-                                                        'props': {
-                                                            'type': 'info',
-                                                            'variant': 'tonal',
-                                                            'text': '启用最大记录数量后，每次发送任务结束，不管是否发送成功，'
-                                                                    '都将进行整理，该功能处理方式为删除文件内记录！\n'
-                                                                    "\n"
-                                                                    '清空所有日志记录功能不需要依赖于启用最大记录数量。\n'
-                                                                    '\n'
-                                                                    '同时启用立刻清空所有日志与立刻整理日志时，'
-                                                                    '优先运行立刻整理日志，且自动关闭清空所有日志开关，'
-                                                                    '避免误操作！',
-                                                            'style': 'white-space: pre-line;',
-                                                        }
-                                                    }
-                                                ]
-                                            }
-                                        ]
-                                    },
-                                ]
-                            },
-                            #         {
-                            #             'component': 'VWindowItem',
-                            #             'props': {
-                            #                 'value': 'msg_rules',
-                            #                 'style': {
-                            #                     'padding-top': '20px',
-                            #                     'padding-bottom': '20px'
-                            #                 },
-                            #             },
-                            #             'content': [
-                            #                 {
-                            #                     'component': 'VRow',
-                            #                     'props': {
-                            #                         'align': 'center'
-                            #                     },
-                            #                     'content': [
-                            #                         {
-                            #                             'component': 'VCol',
-                            #                             'props': {
-                            #                                 'cols': 12,
-                            #                                 'md': 3
-                            #                             },
-                            #                             'content': [
-                            #                                 {
-                            #                                     'component': 'VSwitch',
-                            #                                     'props': {
-                            #                                         'model': 'enabled_msg_rules',
-                            #                                         'label': '启用消息过滤',
-                            #                                     }
-                            #                                 }
-                            #                             ]
-                            #                         },
-                            #                         {
-                            #                             'component': 'VCol',
-                            #                             'props': {
-                            #                                 'cols': 12,
-                            #                                 'md': 3
-                            #                             },
-                            #                             'content': [
-                            #                                 {
-                            #                                     'component': 'VSwitch',
-                            #                                     'props': {
-                            #                                         'model': 'enabled_customizable_msg_rules',
-                            #                                         'label': '启用自定义过滤规则',
-                            #                                     }
-                            #                                 }
-                            #                             ]
-                            #                         },
-                            #                         {
-                            #                             "component": "VCol",
-                            #                             "props": {
-                            #                                 "cols": 12,
-                            #                                 "md": 4
-                            #                             },
-                            #                             "content": [
-                            #                                 {
-                            #                                     "component": "VSwitch",
-                            #                                     "props": {
-                            #                                         "model": "dialog_closed",
-                            #                                         "label": "打开自定义过滤规则设置窗口"
-                            #                                     }
-                            #                                 }
-                            #                             ]
-                            #                         },
-                            #                     ]
-                            #                 },
-                            #                 {
-                            #                     'component': 'VRow',
-                            #                     'props': {
-                            #                             'align': 'center'
-                            #                     },
-                            #                     'content': [
-                            #                         {
-                            #                             'component': 'VCol',
-                            #                             'props': {
-                            #                                 'cols': 12,
-                            #                             },
-                            #                             'content': [
-                            #                                 {
-                            #                                     'component': 'VAlert',
-                            #                                     'props': {
-                            #                                         'type': 'info',
-                            #                                         'variant': 'tonal',
-                            #                                         'text': '该功能为结合已安装插件的插件名，对消息内容进行二次过滤；'
-                            #                                                 '不启用自定义过滤规则时，默认屏蔽整个插件的消息'
-                            #                                     }
-                            #                                 }
-                            #                             ]
-                            #                         }
-                            #                     ]
-                            #                 },
-                            #                 {
-                            #                     'component': 'VRow',
-                            #                     'props': {
-                            #                             'align': 'center'
-                            #                     },
-                            #                     'content': [
-                            #                         {
-                            #                             'component': 'VCol',
-                            #                             'props': {
-                            #                                 'cols': 12,
-                            #                             },
-                            #                             'content': [
-                            #                                 {
-                            #                                     'component': 'VAutocomplete',
-                            #                                     'props': {
-                            #                                         'multiple': True,
-                            #                                         'chips': True,
-                            #                                         'model': 'allow_plugins',
-                            #                                         'label': '需要管理的插件',
-                            #                                         'placeholder': '留空，则默认选择所有插件',
-                            #                                         'items': PluginTypeOptions,
-                            #                                         "clearable": True,
-                            #                                     }
-                            #                                 }
-                            #                             ]
-                            #                         },
-                            #                     ]
-                            #                 },
-                            #                 {
-                            #                     'component': 'VRow',
-                            #                     'props': {
-                            #                             'align': 'center'
-                            #                     },
-                            #                     'content': [
-                            #                         {
-                            #                             'component': 'VCol',
-                            #                             'props': {
-                            #                                 'cols': 12
-                            #
-                            #                             },
-                            #                             'content': [
-                            #                                 {
-                            #                                     'component': 'VAutocomplete',
-                            #                                     'props': {
-                            #                                         'multiple': True,
-                            #                                         'chips': True,
-                            #                                         'model': 'block_plugins',
-                            #                                         'label': '需要排除的插件',
-                            #                                         'placeholder': '留空，则默认不过滤任何插件',
-                            #                                         'items': PluginTypeOptions,
-                            #                                         'clearable': True,
-                            #                                     }
-                            #                                 }
-                            #                             ]
-                            #                         },
-                            #                     ]
-                            #                 },
-                            #                 {
-                            #                     'component': 'VRow',
-                            #                     'props': {
-                            #                             'align': 'center'
-                            #                     },
-                            #                     'content': [
-                            #                         {
-                            #                             'component': 'VCol',
-                            #                             'props': {
-                            #                                 'cols': 12,
-                            #                             },
-                            #                             'content': [
-                            #                                 {
-                            #                                     'component': 'VAlert',
-                            #                                     'props': {
-                            #                                         'type': 'warning',
-                            #                                         'variant': 'tonal',
-                            #                                         'text': '目前只支持插件名与邮件主题名一致的插件；'
-                            #                                                 '邮件主题 =【插件名】、{title} = '
-                            #                                                 '【{local_plugin.plugin_name}】'
-                            #                                     }
-                            #                                 }
-                            #                             ]
-                            #                         }
-                            #                     ]
-                            #                 },
-                            #             ]
-                            #         },
-                            #     ]
-                            # },
-                            # {
-                            #     "component": "VDialog",
-                            #     "props": {
-                            #         "model": "dialog_closed",
-                            #         "max-width": "65rem",
-                            #         "overlay-class": "v-dialog--scrollable v-overlay--scroll-blocked",
-                            #         "content-class": "v-card v-card--density-default v-card--variant-elevated rounded-t"
-                            #     },
-                            #     "content": [
-                            #         {
-                            #             "component": "VCard",
-                            #             "props": {
-                            #                 "title": "设置自定义过滤规则"
-                            #             },
-                            #             "content": [
-                            #                 {
-                            #                     "component": "VDialogCloseBtn",
-                            #                     "props": {
-                            #                         "model": "dialog_closed"
-                            #                     }
-                            #                 },
-                            #                 {
-                            #                     "component": "VCardText",
-                            #                     "props": {},
-                            #                     "content": [
-                            #                         {
-                            #                             'component': 'VRow',
-                            #                             'content': [
-                            #                                 {
-                            #                                     'component': 'VCol',
-                            #                                     'props': {
-                            #                                         'cols': 12,
-                            #                                     },
-                            #                                     'content': [
-                            #                                         {
-                            #                                             'component': 'VAceEditor',
-                            #                                             'props': {
-                            #                                                 'modelvalue': 'site_config',
-                            #                                                 'lang': 'json',
-                            #                                                 'theme': 'monokai',
-                            #                                                 'style': 'height: 30rem',
-                            #                                             }
-                            #                                         }
-                            #                                     ]
-                            #                                 }
-                            #                             ]
-                            #                         },
-                            #                         {
-                            #                             'component': 'VRow',
-                            #                             'props': {
-                            #                                     'align': 'center'
-                            #                             },
-                            #                             'content': [
-                            #                                 {
-                            #                                     'component': 'VCol',
-                            #                                     'props': {
-                            #                                         'cols': 12,
-                            #                                     },
-                            #                                     'content': [
-                            #                                         {
-                            #                                             'component': 'VAlert',
-                            #                                             'props': {
-                            #                                                 'type': 'info',
-                            #                                                 'variant': 'tonal'
-                            #                                             },
-                            #                                             'content': [
-                            #                                                 {
-                            #                                                     'component': 'span',
-                            #                                                     'text': '注意：只有启用高级自定义过滤时，该配置项才会生效，详细配置参考：'
-                            #                                                 },
-                            #                                                 {
-                            #                                                     'component': 'a',
-                            #                                                     'props': {
-                            #                                                         'href': 'https://github.com/Aqr-K/MoviePilot-Plugins/blob/main/plugins/smtpmsg',
-                            #                                                         'target': '_blank'
-                            #                                                     },
-                            #                                                     'content': [
-                            #                                                         {
-                            #                                                             'component': 'u',
-                            #                                                             'text': 'README'
-                            #                                                         }
-                            #                                                     ]
-                            #                                                 },
-                            #                                             ]
-                            #                                         },
-                            #                                     ]
-                            #                                 }
-                            #                             ]
-                            #                         },
-                            #                         {
-                            #                             'component': 'VRow',
-                            #                             'props': {
-                            #                                     'align': 'center'
-                            #                             },
-                            #                             'content': [
-                            #                                 {
-                            #                                     'component': 'VCol',
-                            #                                     'props': {
-                            #                                         'cols': 12,
-                            #                                     },
-                            #                                     'content': [
-                            #                                         {
-                            #                                             'component': 'VAlert',
-                            #                                             'props': {
-                            #                                                 'type': 'info',
-                            #                                                 'variant': 'tonal',
-                            #                                                 'text': '注意：当"需要管理的插件"中的插件，'
-                            #                                                         '在自定义过滤规则未配置内容时，'
-                            #                                                         '默认过滤整个插件的消息'
-                            #                                             }
-                            #                                         }
-                            #                                     ]
-                            #                                 }
-                            #                             ]
-                            #                         },
-                            #                     ]
-                            #                 }
-                            #             ]
-                            #         }
-                        ]
-                    }
-                ]
-            }
-        ], {
-            'enabled': False,
-            'test': False,
-
-            'server_timeout': 10,
-
-            'main': True,
-            'main_smtp_host': "",
-            'main_smtp_port': "",
-            'main_smtp_encryption': "not_encrypted",
-            'main_sender_mail': "",
-            'main_sender_password': "",
-
-            'secondary': False,
-            'secondary_smtp_host': "",
-            'secondary_smtp_port': "",
-            'secondary_smtp_encryption': "not_encrypted",
-            'secondary_sender_mail': "",
-            'secondary_sender_password': "",
-
-            'enabled_image_send': False,
-            'enabled_proxy_image': True,
-            'enabled_github_proxy_image': True,
-            'image_timeout': 10,
-            'sender_name': "",
-            'receiver_mail': "",
-            'msgtypes': [],
-            'other_msgtypes': False,
-
-            'enabled_customizable_mail_template': False,
-            'save': False,
-            'reset': False,
-            'content': self.custom_template.read_text(encoding="utf-8"),
-
-            'enabled_msg_rules': False,
-            'enabled_customizable_msg_rules': False,
-
-            'log_more': False,
-            'clean_all_log': False,
-            'onlyonce_clean': False,
-            'enabled_scheduled_clean': False,
-            'cron': '0 0 7 * * ',
-            'rows': 100,
-        }
+        return _build_form_schema(), {**self._form_defaults, 'content': self._read_template()}
 
     def get_page(self) -> List[dict]:
         pass
@@ -1783,6 +1265,8 @@ class SmtpMsg(_PluginBase):
                     self._scheduler.shutdown(wait=False)
                     self._event.clear()
                 self._scheduler = None
+            self._stop_queue()
+            SmtpMsgConnectionPool.close_all()
         except Exception as e:
             logger.info(str(e))
 
@@ -1799,7 +1283,7 @@ class SmtpMsg(_PluginBase):
                 self.systemmessage.put("最大记录数量不能小于等于0，清理日志失败！")
             self._onlyonce_clean = False
             self._clean_all_log = False
-            self.__update_config()
+            self._config_dirty = True
 
         elif self._clean_all_log:
             try:
@@ -1808,7 +1292,43 @@ class SmtpMsg(_PluginBase):
             except Exception as e:
                 self.systemmessage(f"清空日志失败 - 原因 - {e}")
             self._clean_all_log = False
-            self.__update_config()
+            self._config_dirty = True
+
+    def _load_template(self) -> Tuple[str, bytes]:
+        """
+        读取自定义模板及其摘要，文件未修改时直接使用缓存内容
+        """
+        mtime = self.custom_template.stat().st_mtime_ns
+        if self._template_cache and self._template_cache[0] == mtime:
+            return self._template_cache[1], self._template_cache[2]
+        data = self.custom_template.read_bytes()
+        content, digest = data.decode("utf-8"), _content_digest(data)
+        self._template_cache = (mtime, content, digest)
+        return content, digest
+
+    def _read_template(self) -> str:
+        """
+        读取自定义模板
+        """
+        return self._load_template()[0]
+
+    def _get_content_hash(self) -> bytes:
+        """
+        获取当前模板配置的摘要，内容未变化时直接使用缓存
+        """
+        if self._content_hash is None or self._content_hash[0] is not self._content:
+            # 数据库内配置可能为 None，按空内容计算，与文件内容不一致时使用文件内容
+            self._content_hash = (self._content, _content_digest((self._content or "").encode("utf-8")))
+        return self._content_hash[1]
+
+    def _restore_default_template(self):
+        """
+        使用默认模板覆盖自定义模板，先写入临时文件再原子替换
+        """
+        temp_template = self.custom_template.with_suffix(".tmp")
+        shutil.copyfile(self.default_template, temp_template)
+        os.replace(temp_template, self.custom_template)
+        self._template_cache = None
 
     def _check_path(self):
         """
@@ -1819,77 +1339,65 @@ class SmtpMsg(_PluginBase):
     @SmtpMsgDecorator.log("文件检查")
     def __check_template_file(self, log_container):
         msg = level = None
-        try:
-            # 自定义模板不存在，创建模板文件
-            if not self.custom_template.exists():
-                self.custom_template_dir.mkdir(parents=True, exist_ok=True)
-                self.custom_template.touch()
-                # 如果_content不为空，写入自定义模板
-                if self._content:
-                    self.custom_template.write_text(self._content, encoding="utf-8")
-                    msg = "自定义邮件模板文件不存在，已创建模板文件，已将数据库内配置写入文件"
-                # 否则，复制默认模板到自定义模板
-                else:
-                    self.default_template.replace(self.custom_template)
-                    msg = "自定义邮件模板文件不存在，已创建模板文件，数据库内没有该项配置，还原使用默认配置"
-
-            # 自定义模板存在
-            elif self.custom_template.exists():
-                # 内容是否一致
-                if (self._save is not True
-                        and self._reset is not True
-                        and self._content != self.custom_template.read_text(encoding="utf-8")):
-                    self._content = self.custom_template.read_text(encoding="utf-8")
-                    self.__update_config()
-                    msg = "自定义邮件模板文件已存在，但与数据库内缓存不一致，提取文件配置并覆盖数据库配置"
-                else:
-                    msg = '自定义邮件模板文件已存在'
-                level = 1
-        except Exception as e:
-            level = -1
-            raise Exception(f'未知错误 - 原因 - {e}')
-        finally:
-            log_container['msg'] = msg
-            log_container['level'] = level
+        # 自定义模板不存在，创建模板文件
+        if not self.custom_template.exists():
+            self.custom_template_dir.mkdir(parents=True, exist_ok=True)
+            self.custom_template.touch()
+            # 如果_content不为空，写入自定义模板
+            if self._content:
+                self.custom_template.write_text(self._content, encoding="utf-8")
+                self._template_cache = None
+                msg = "自定义邮件模板文件不存在，已创建模板文件，已将数据库内配置写入文件"
+            # 否则，复制默认模板到自定义模板
+            else:
+                self._restore_default_template()
+                msg = "自定义邮件模板文件不存在，已创建模板文件，数据库内没有该项配置，还原使用默认配置"
+
+        # 自定义模板存在
+        elif self.custom_template.exists():
+            # 内容是否一致
+            content, digest = self._load_template()
+            if (self._save is not True
+                    and self._reset is not True
+                    and self._get_content_hash() != digest):
+                self._content = content
+                self._config_dirty = True
+                msg = "自定义邮件模板文件已存在，但与数据库内缓存不一致，提取文件配置并覆盖数据库配置"
+            else:
+                msg = '自定义邮件模板文件已存在'
+            level = 1
+        log_container.msg = msg
+        log_container.level = level
 
     @SmtpMsgDecorator.log("模板配置")
     def _template_settings(self, log_container):
         msg = level = None
-        try:
-            # 保存自定义模板
-            if self._save or self._reset:
-                if self._save is True:
-                    self.custom_template.write_text(self._content, encoding="utf-8")
-                    self._save = False
-                    self.__update_config()
-                    if self._reset is True:
-                        self._reset = False
-                        self.__update_config()
-                        msg = f"自定义模板与恢复默认模板不可同时启动，关闭恢复默认模板按钮！自定义邮件模板保存成功！"
-                    else:
-                        msg = "自定义邮件模板保存成功！"
-                    self.systemmessage.put(msg)
-                elif self._save is not True and self._reset is True:
-                    shutil.copy(self.default_template, self.custom_template)
-                    self._content = self.custom_template.read_text(encoding="utf-8")
+        # 保存自定义模板
+        if self._save or self._reset:
+            if self._save is True:
+                self.custom_template.write_text(self._content, encoding="utf-8")
+                self._template_cache = None
+                self._save = False
+                if self._reset is True:
                     self._reset = False
-                    self.__update_config()
-                    msg = "默认邮件模板恢复成功！"
-                if msg:
-                    self.systemmessage.put(msg)
-                    level = 1
-                    return msg
-            else:
+                    msg = f"自定义模板与恢复默认模板不可同时启动，关闭恢复默认模板按钮！自定义邮件模板保存成功！"
+                else:
+                    msg = "自定义邮件模板保存成功！"
+                self._config_dirty = True
+            elif self._save is not True and self._reset is True:
+                self._restore_default_template()
+                self._content = self._read_template()
+                self._reset = False
+                self._config_dirty = True
+                msg = "默认邮件模板恢复成功！"
+            if msg:
+                self.systemmessage.put(msg)
                 level = 1
-                msg = "写入自定义模板与恢复默认模板功能未启用"
-        except Exception as e:
-            level = -1
-            msg = f"模板配置运行失败 - 原因 - {e}"
-            raise Exception(msg)
-
-        finally:
-            log_container['msg'] = msg
-            log_container['level'] = level
+        else:
+            level = 1
+            msg = "写入自定义模板与恢复默认模板功能未启用"
+        log_container.msg = msg
+        log_container.level = level
 
     def _run_plugin(self):
         """
@@ -1899,18 +1407,69 @@ class SmtpMsg(_PluginBase):
         if self._main is False and self._secondary is False:
             self._enabled = False
             self._test = False
-            self.__update_config()
+            self._config_dirty = True
             msg = "当前参数配置不完整，主服务器与备用服务器至少需要启用一个，关闭插件"
             logger.warning(msg)
             self.systemmessage.put(f"{self.plugin_name}插件{msg}")
             return
         else:
+            if self._enabled:
+                self._start_queue()
             if self._test:
-                msg = self.master_program()
+                msg = self.master_program(test=True)
                 self._test = False
-                self.__update_config()
+                self._config_dirty = True
                 self.systemmessage.put(msg)
 
+    def _start_queue(self):
+        """
+        为每个启用的服务器启动后台发送线程，主备服务器可同时处理不同的消息
+        """
+        queues = {}
+        if self._main:
+            queues[0] = queue.Queue()
+        if self._secondary:
+            queues[1] = queue.Queue()
+        self._queues = queues
+        for smtp_value, msg_queue in queues.items():
+            next_queue = queues.get(1) if smtp_value == 0 else None
+            threading.Thread(target=self._queue_worker, args=(smtp_value, msg_queue, next_queue),
+                             name=f"SmtpMsgQueue-{smtp_value}", daemon=True).start()
+
+    def _stop_queue(self):
+        """
+        停止后台发送线程，已入队的消息（包括转交备用服务器的消息）发送完成后退出
+        """
+        queues, self._queues = self._queues, None
+        if queues:
+            # 结束信号经由主服务器线程转交备用服务器线程，保证转交的消息不会丢失
+            queues[min(queues)].put(None)
+
+    def _queue_worker(self, smtp_value: int, msg_queue: queue.Queue, next_queue: Optional[queue.Queue]):
+        """
+        依次发送队列中的消息，连续的消息复用连接池中的同一个会话；
+        主服务器发送失败的消息转交同一组的备用服务器线程（next_queue）发送
+        """
+        while True:
+            item = msg_queue.get()
+            if item is None:
+                if next_queue:
+                    next_queue.put(None)
+                return
+            kwargs, m_success = item
+            try:
+                if smtp_value == 0:
+                    m_success = self._run_server(smtp_value=0, m_success=None, **kwargs)
+                    if next_queue and m_success is not True:
+                        next_queue.put((kwargs, m_success))
+                        continue
+                    self._generate_result_log(m_success, None)
+                else:
+                    s_success = self._run_server(smtp_value=1, m_success=m_success, **kwargs)
+                    self._generate_result_log(m_success, s_success)
+            except Exception as e:
+                logger.error(f"日志汇报 - 错误 - 后台发送失败 - 原因 - {e}")
+
     # task
 
     @eventmanager.register(EventType.NoticeMessage)
@@ -1918,13 +1477,10 @@ class SmtpMsg(_PluginBase):
         """
         消息发送事件
         """
-        if not self.get_state():
-            return
-        if not event.event_data:
+        if not self._enabled:
             return
         msg_body = event.event_data
-        channel = msg_body.get("channel")
-        if channel:
+        if not msg_body or msg_body.get("channel"):
             return
         msg_type: NotificationType = msg_body.get("type")
         title = msg_body.get("title")
@@ -1934,47 +1490,62 @@ class SmtpMsg(_PluginBase):
         if not title and not text:
             logger.warning("标题和内容不能同时为空")
             return
-        if (msg_type and self._msgtypes
-                and msg_type.name not in self._msgtypes):
+        if (msg_type and self._msgtype_set
+                and msg_type.name not in self._msgtype_set):
             if not self._other_msgtypes:
                 logger.info(f"消息类型 {msg_type.value} 未开启消息发送")
                 return
-        self.master_program(title=title, text=text, msg_type=msg_type, userid=userid, image=image)
+        kwargs = dict(title=title, text=text, msg_type=msg_type, userid=userid, image=image)
+        # 重新加载时其他线程可能同时替换队列，只读取一次
+        queues = self._queues
+        if queues:
+            # 启用主服务器时先交给主服务器，否则直接交给备用服务器
+            queues[min(queues)].put((kwargs, None))
+        else:
+            self.master_program(**kwargs)
 
-    def master_program(self, title=None, text=None, msg_type=None, userid=None, image=None):
+    def master_program(self, title=None, text=None, msg_type=None, userid=None, image=None, test=False):
         """
-        运行主要逻辑
+        运行主要逻辑，test 为 True 时发送测试邮件；
+        测试标记随调用传递，不读取实例状态，避免影响同时在后台发送的消息
         """
-        with SmtpMsgLock:
-            # todo: 消息过滤，待完善
-            # self.__msg_filter(title=title, text=text, msg_type=msg_type, userid=userid)
-
-            m_success = s_success = None
+        # todo: 消息过滤，待完善
+        # self.__msg_filter(title=title, text=text, msg_type=msg_type, userid=userid)
+
+        m_success = s_success = None
+        kwargs = dict(msg_type=msg_type, title=title, text=text, userid=userid, image=image, test=test)
+        if test and self._main and self._secondary:
+            # 测试时两个服务器互不依赖，备用服务器在后台线程中同时发送
+            with ThreadPoolExecutor(max_workers=1, thread_name_prefix="SmtpMsgTest") as executor:
+                s_future = executor.submit(self._run_server, smtp_value=1, m_success=None, **kwargs)
+                m_success = self._run_server(smtp_value=0, m_success=None, **kwargs)
+                s_success = s_future.result()
+        else:
             if self._main:
-                smtp_value = 0
-                success, server_type = self._determine_server(smtp_value=smtp_value, success=m_success)
-                if success:
-                    m_success = self._send_to_smtp(smtp_value=smtp_value, server_type=server_type,
-                                                   msg_type=msg_type, title=title, text=text, userid=userid,
-                                                   image=image)
+                m_success = self._run_server(smtp_value=0, m_success=m_success, **kwargs)
             if self._secondary:
-                smtp_value = 1
-                success, server_type = self._determine_server(smtp_value=smtp_value, success=m_success)
-                if success:
-                    s_success = self._send_to_smtp(smtp_value=smtp_value, server_type=server_type,
-                                                   msg_type=msg_type, title=title, text=text, userid=userid,
-                                                   image=image)
-            # 打印结果
-            msg = self._generate_result_log(m_success, s_success)
-            return msg
+                s_success = self._run_server(smtp_value=1, m_success=m_success, **kwargs)
+        # 打印结果
+        msg = self._generate_result_log(m_success, s_success, test=test)
+        return msg
+
+    def _run_server(self, smtp_value, m_success, test=False, **kwargs):
+        """
+        判断是否需要调用该服务器，需要时发送邮件，未调用时返回 None
+        """
+        success, server_type = self._determine_server(smtp_value=smtp_value, success=m_success, test=test)
+        if success:
+            return self._send_to_smtp(smtp_value=smtp_value, server_type=server_type, test=test, **kwargs)
+        return None
 
     @SmtpMsgDecorator.log("邮件发送")
     def _send_to_smtp(self, smtp_value, log_container, server_type,
-                      msg_type=None, title=None, text=None, image=None, userid=None):
+                      msg_type=None, title=None, text=None, image=None, userid=None, test=False):
         """
         连接-构建-发送 逻辑
         """
-        msg = level = server = None
+        msg = level = server = smtp_settings = None
+        success = reuse = False
         try:
             if smtp_value == 0:
                 smtp_type = "main"
@@ -1986,33 +1557,36 @@ class SmtpMsg(_PluginBase):
             # 消息参数校验
             title, text, image, userid, msg_type = (
                 self._msg_parameter_validation(msg_type=msg_type, title=title, text=text, image=image, userid=userid,
-                                               server_type=server_type))
+                                               server_type=server_type, test=test))
             # 读取服务端配置
-            self._get_dict_value(server_type=server_type, smtp_type=smtp_type)
-            # 连接与认证 SMTP 服务器
-            server = self._connect_to_smtp_server()
+            smtp_settings = self._get_dict_value(server_type=server_type, smtp_type=smtp_type)
             # 读取收件人与发件人配置
-            receiver_list, sender_name, sender_mail = self._get_receiver_and_sender()
+            receiver_list, sender_name, sender_mail = self._get_receiver_and_sender(smtp_settings=smtp_settings)
             # 构建邮件
             message = self._msg_build_email(title=title, text=text, image=image, userid=userid, msg_type=msg_type,
                                             sender_name=sender_name, sender_mail=sender_mail)
-            # 发送邮件
-            send_status = self._send_msg_to_smtp(server=server, message=message, sender_mail=self._sender_mail,
-                                                 receiver_list=receiver_list, server_type=server_type)
+            with _host_lock(smtp_settings["host"], smtp_settings["port"]):
+                # 连接与认证 SMTP 服务器
+                server = self._connect_to_smtp_server(smtp_settings=smtp_settings)
+                # 发送邮件
+                send_status = self._send_msg_to_smtp(server=server, message=message, sender_mail=sender_mail,
+                                                     receiver_list=receiver_list, server_type=server_type,
+                                                     test=test)
 
             msg = "邮件发送成功" if send_status else "邮件发送失败"
-            success = True if send_status else False
+            success = reuse = True if send_status else False
             level = 1
             return success
         except Exception as e:
             msg = f'出现错误 - {e}'
             success = False
+            reuse = _connection_reusable(server, e)
             level = -1
             return success
         finally:
-            self._quit_server(server=server)
-            log_container['msg'] = msg
-            log_container['level'] = level
+            self._quit_server(server=server, smtp_settings=smtp_settings, reuse=reuse)
+            log_container.msg = msg
+            log_container.level = level
 
     # filter
 
@@ -2029,126 +1603,111 @@ class SmtpMsg(_PluginBase):
     # smtp_server
 
     @SmtpMsgDecorator.log("服务器调用判断")
-    def _determine_server(self, smtp_value, success, log_container):
-        msg = level = None
-        try:
-            if smtp_value == 0:
-                server_type = "主"
-            elif smtp_value == 1:
-                server_type = "备用"
-            else:
-                raise Exception("未知的SMTP服务器类型")
-            if self._test and smtp_value == 1:
-                status = self._secondary
+    def _determine_server(self, smtp_value, success, log_container, test=False):
+        if smtp_value == 0:
+            server_type = "主"
+        elif smtp_value == 1:
+            server_type = "备用"
+        else:
+            raise Exception("未知的SMTP服务器类型")
+        if test and smtp_value == 1:
+            status = self._secondary
+        else:
+            if success:
+                status = False
             else:
-                if success:
-                    status = False
-                else:
-                    status = True
-            result = "开始调用" if status else "不需要调用"
-            success = status
-            msg = f'{server_type}服务器调用判断 - {result}'
-            level = 1
-            return success, server_type
-        except Exception as e:
-            level = -1
-            msg = f'判断失败 - 原因 - {e}'
-            raise Exception(msg)
-        finally:
-            log_container['msg'] = msg
-            log_container['level'] = level
+                status = True
+        result = "开始调用" if status else "不需要调用"
+        log_container.msg = f'{server_type}服务器调用判断 - {result}'
+        log_container.level = 1
+        return status, server_type
 
     @SmtpMsgDecorator.log("服务器连接")
-    def _connect_to_smtp_server(self, log_container):
-        msg = level = server_timeout = None
+    def _connect_to_smtp_server(self, smtp_settings, log_container):
+        import smtplib
         try:
-            try:
-                try:
-                    if self._server_timeout:
-                        if float(self._server_timeout) > 0:
-                            server_timeout = float(self._server_timeout)
-                    else:
-                        server_timeout = float(10)
-                except (ValueError, TypeError):
-                    server_timeout = float(10)
-
-                if self._encryption == "ssl":
-                    server = smtplib.SMTP_SSL(self._host, self._port, timeout=server_timeout)
-                else:
-                    server = smtplib.SMTP(self._host, self._port, timeout=server_timeout)
-                    if self._encryption == "tls":
-                        server.starttls()
-
-                server.ehlo(self._host)
-                server.login(self._sender_mail, self._password)
-                msg = "地址连接成功"
-                level = 1
+            server_timeout = self._connect_timeout
+            server = SmtpMsgConnectionPool.acquire(self._pool_key(smtp_settings))
+            if server:
+                log_container.msg = "复用已有连接"
+                log_container.level = 1
                 return server
-            except socket.timeout as e:
-                raise Exception(f'建立连接超时 - {e}')
-            except socket.gaierror as e:
-                raise Exception(f'无法解析主机名或 IP 地址 - {e}')
-            except smtplib.SMTPConnectError as e:
-                raise Exception(f'无法建立连接 - {e}')
-            except smtplib.SMTPAuthenticationError as e:
-                raise Exception(f'登录失败，用户名或密码错误 - {e}')
-            except smtplib.SMTPResponseException as e:
-                raise Exception(f'返回异常状态码: {e.smtp_code}')
-            except smtplib.SMTPServerDisconnected as e:
-                raise Exception(f'连接已断开 - {e}')
-            except smtplib.SMTPNotSupportedError as e:
-                raise Exception(f'不支持所需的身份验证方法 - {e}')
-            except (smtplib.SMTPException, Exception) as e:
-                raise Exception(f'登录或者连接时出现未知异常 - {e}')
-        except Exception as e:
-            level = -1
-            raise Exception(e)
 
-        finally:
-            log_container['msg'] = msg
-            log_container['level'] = level
+            # 解析失败、连接被拒绝或断开等很快返回的网络波动按指数退避重试；
+            # 超时已经等满了超时时间，与认证失败等错误一样直接汇报，交给备用服务器处理
+            retryable = (socket.gaierror, ConnectionError, smtplib.SMTPConnectError, smtplib.SMTPServerDisconnected)
+            for attempt in range(_CONNECT_ATTEMPTS):
+                try:
+                    server = _open_smtp_connection(smtp_settings, server_timeout)
+                    break
+                except retryable as e:
+                    # smtplib 会把读取超时包装成连接断开，同样不再重试
+                    if attempt + 1 >= _CONNECT_ATTEMPTS or isinstance(e.__context__, socket.timeout):
+                        raise
+                    delay = _CONNECT_BACKOFF * 2 ** attempt
+                    logger.warning(f"日志汇报 - 警告 - 服务器连接失败，{delay}秒后重试 - 原因 - {e}")
+                    time.sleep(delay)
+            log_container.msg = "地址连接成功"
+            log_container.level = 1
+            return server
+        except socket.timeout as e:
+            raise Exception(f'建立连接超时 - {e}') from e
+        except socket.gaierror as e:
+            raise Exception(f'无法解析主机名或 IP 地址 - {e}') from e
+        except smtplib.SMTPConnectError as e:
+            raise Exception(f'无法建立连接 - {e}') from e
+        except smtplib.SMTPAuthenticationError as e:
+            raise Exception(f'登录失败，用户名或密码错误 - {e}') from e
+        except smtplib.SMTPResponseException as e:
+            raise Exception(f'返回异常状态码: {e.smtp_code}') from e
+        except smtplib.SMTPServerDisconnected as e:
+            raise Exception(f'连接已断开 - {e}') from e
+        except smtplib.SMTPNotSupportedError as e:
+            raise Exception(f'不支持所需的身份验证方法 - {e}') from e
+        except ConnectionError as e:
+            raise Exception(f'连接被拒绝或重置 - {e}') from e
+        except Exception as e:
+            raise Exception(f'登录或者连接时出现未知异常 - {e}') from e
 
     @SmtpMsgDecorator.log("邮件发送")
-    def _send_msg_to_smtp(self, server, message, sender_mail, receiver_list, server_type, log_container):
-        test_type = "测试" if self._test else ""
-        msg = level = None
+    def _send_msg_to_smtp(self, server, message, sender_mail, receiver_list, server_type, log_container, test=False):
+        import smtplib
+        test_type = "测试" if test else ""
         try:
-            try:
-                server.sendmail(sender_mail, receiver_list, message.as_string())
-            except socket.timeout as e:
-                raise Exception(f"连接超时 - {e}")
-            except (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused) as e:
-                raise Exception(f"拒绝了接受或发送者地址 - {e}")
-            except smtplib.SMTPDataError as e:
-                raise Exception(f"拒绝了接受邮件数据，返回了错误响应 - {e}")
-            except (smtplib.SMTPServerDisconnected, ConnectionError) as e:
-                raise Exception(f"断开了连接 - {e}")
-            except smtplib.SMTPAuthenticationError as e:
-                raise Exception(f"身份验证失败 - {e}")
-            except smtplib.SMTPNotSupportedError as e:
-                raise Exception(f"不支持某些功能 - {e}")
-            except smtplib.SMTPException as e:
-                raise Exception(f"出现了未知原因 - {e}")
-            msg = f"使用{server_type} SMTP 服务器发送{test_type}邮件成功"
-            level = 1
+            # 直接按 SMTP 要求的 CRLF 换行序列化为字节，省去字符串再编码与换行转换
+            data = message.as_bytes(policy=message.policy.clone(linesep="\r\n"))
+            _pipelined_sendmail(server, sender_mail, receiver_list, data)
+        except socket.timeout as e:
+            reason, error = f"连接超时 - {e}", e
+        except (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused) as e:
+            reason, error = f"拒绝了接受或发送者地址 - {e}", e
+        except smtplib.SMTPDataError as e:
+            reason, error = f"拒绝了接受邮件数据，返回了错误响应 - {e}", e
+        except (smtplib.SMTPServerDisconnected, ConnectionError) as e:
+            reason, error = f"断开了连接 - {e}", e
+        except smtplib.SMTPAuthenticationError as e:
+            reason, error = f"身份验证失败 - {e}", e
+        except smtplib.SMTPNotSupportedError as e:
+            reason, error = f"不支持某些功能 - {e}", e
+        except smtplib.SMTPException as e:
+            reason, error = f"出现了未知原因 - {e}", e
+        else:
+            log_container.msg = f"使用{server_type} SMTP 服务器发送{test_type}邮件成功"
+            log_container.level = 1
             return True
-        except Exception as e:
-            msg = f"使用{server_type} SMTP 服务器发送{test_type}邮件失败 - 原因 - {e}"
-            level = -1
-            raise Exception(msg)
-        finally:
-            log_container['msg'] = msg
-            log_container['level'] = level
+        raise Exception(f"使用{server_type} SMTP 服务器发送{test_type}邮件失败 - 原因 - {reason}") from error
 
     @SmtpMsgDecorator.log("关闭连接")
-    def _quit_server(self, server, log_container):
+    def _quit_server(self, server, smtp_settings, log_container, reuse=False):
         """
-        断开服务器连接
+        断开服务器连接，发送成功的连接放回连接池复用
         """
-        msg = level = None
         try:
-            if server:
-                server.quit()
+            if server and reuse:
+                SmtpMsgConnectionPool.release(self._pool_key(smtp_settings), server)
+                msg = '连接已放回连接池'
+            elif server:
+                SmtpMsgConnectionPool.discard(server)
                 msg = '关闭连接成功'
             else:
                 msg = '未连接到服务器，无需关闭'
@@ -2156,118 +1715,78 @@ class SmtpMsg(_PluginBase):
         except Exception as e:
             level = -1
             msg = f'关闭连接失败 - 原因 - {e}'
-        finally:
-            log_container['msg'] = msg
-            log_container['level'] = level
+        log_container.msg = msg
+        log_container.level = level
 
     # setting
 
     @SmtpMsgDecorator.log("消息参数校验")
     def _msg_parameter_validation(self, log_container, server_type, msg_type=None, title=None, text=None, image=None,
-                                  userid=None):
-        msg = level = None
-        try:
-            if self._test:
-                msg_type = '测试邮件'
-            else:
-                if isinstance(msg_type, NotificationType):
-                    msg_type = msg_type.value
-                else:
-                    if msg_type is None:
-                        msg_type = ''
-                    elif self._other_msgtypes:
-                        msg_type = msg_type
-                    else:
-                        raise Exception("接收到不被支持的消息类型，且未开启第三方消息类型")
-
-            if self._test:
-                title = f"测试{server_type}服务器配置"
-            else:
-                title = title if title is not None else f"【{self.plugin_name}】"
-
-            if self._test:
-                text = "这是一封测试邮件~~~"
-            else:
-                text = text if text is not None else ""
-
-            if self._test:
-                userid = "测试用户"
-            else:
-                userid = userid if userid is not None else ""
-
-            if self._test:
-                image = self._test_image
-            else:
-                image = image if image is not None else ""
-
-            msg = f"消息参数校验成功 - 当前消息类型 - {msg_type}"
-            level = 1
-            return title, text, image, userid, msg_type
-
-        except Exception as e:
-            msg = f'邮件变量校验失败 - 原因 - {e}'
-            level = -1
-            raise Exception(msg)
-
-        finally:
-            log_container['msg'] = msg
-            log_container['level'] = level
+                                  userid=None, test=False):
+        if test:
+            # 测试邮件统一使用固定参数
+            msg_type, text, userid = _TEST_MESSAGE
+            title = f"测试{server_type}服务器配置"
+            # 图片参数按字符串识别，与消息中传入的文件路径一致
+            image = str(self._test_image)
+        else:
+            if isinstance(msg_type, NotificationType):
+                msg_type = msg_type.value
+            elif msg_type is None:
+                msg_type = ''
+            elif not self._other_msgtypes:
+                raise Exception("接收到不被支持的消息类型，且未开启第三方消息类型")
+            title = title if title is not None else f"【{self.plugin_name}】"
+            text = text if text is not None else ""
+            userid = userid if userid is not None else ""
+            image = image if image is not None else ""
+
+        log_container.msg = f"消息参数校验成功 - 当前消息类型 - {msg_type}"
+        log_container.level = 1
+        return title, text, image, userid, msg_type
 
     @SmtpMsgDecorator.log("连接配置提取")
     def _get_dict_value(self, server_type, smtp_type, log_container):
         """
         获取配置参数
         """
-        msg = level = None
         try:
-            try:
-                _smtp_settings = self.__smtp_settings()
-                self._host = _smtp_settings[smtp_type]["host"]
-                self._port = _smtp_settings[smtp_type]["port"]
-                self._encryption = _smtp_settings[smtp_type]["encryption"]
-                self._sender_mail = _smtp_settings[smtp_type]["mail"]
-                self._password = _smtp_settings[smtp_type]["password"]
-                msg = f"提取{server_type} SMTP 服务端配置成功"
-                level = 1
-
-            except KeyError as e:
-                raise Exception(f'{server_type} SMTP 服务端配置参数不完整 - {e}')
-            except Exception as e:
-                raise Exception(f'出现异常 - 原因 - {e}')
-        except Exception as e:
-            level = -1
-            raise Exception(e)
-
-        finally:
-            log_container['msg'] = msg
-            log_container['level'] = level
+            smtp_settings = self._smtp_settings[smtp_type]
+        except KeyError as e:
+            raise Exception(f'{server_type} SMTP 服务端配置参数不完整 - {e}') from e
+        log_container.msg = f"提取{server_type} SMTP 服务端配置成功"
+        log_container.level = 1
+        return smtp_settings
 
-    def __smtp_settings(self):
+    @staticmethod
+    def _pool_key(smtp_settings) -> tuple:
         """
-        整合配置参数
+        服务器在连接池中的键，包含密码摘要，修改密码后不会复用旧密码登录的连接
         """
-        try:
-            _smtp_settings = {
-                "main": {
-                    "host": self._main_smtp_host,
-                    "port": self._main_smtp_port,
-                    "encryption": self._main_smtp_encryption,
-                    "mail": self._main_sender_mail,
-                    "password": self._main_sender_password,
-                },
-                "secondary": {
-                    "host": self._secondary_smtp_host,
-                    "port": self._secondary_smtp_port,
-                    "encryption": self._secondary_smtp_encryption,
-                    "mail": self._secondary_sender_mail,
-                    "password": self._secondary_sender_password,
-                }
-            }
-
-            return _smtp_settings
+        password_digest = _content_digest(str(smtp_settings["password"] or "").encode("utf-8"))
+        return (smtp_settings["host"], smtp_settings["port"], smtp_settings["encryption"], smtp_settings["mail"],
+                password_digest)
 
-        except Exception as e:
-            raise Exception(e)
+    def __smtp_settings(self) -> Dict[str, Mapping[str, Any]]:
+        """
+        整合配置参数，结果只读，供发送线程共享
+        """
+        return {
+            "main": MappingProxyType({
+                "host": self._main_smtp_host,
+                "port": self._main_smtp_port,
+                "encryption": self._main_smtp_encryption,
+                "mail": self._main_sender_mail,
+                "password": self._main_sender_password,
+            }),
+            "secondary": MappingProxyType({
+                "host": self._secondary_smtp_host,
+                "port": self._secondary_smtp_port,
+                "encryption": self._secondary_smtp_encryption,
+                "mail": self._secondary_sender_mail,
+                "password": self._secondary_sender_password,
+            }),
+        }
 
     # message
 
@@ -2275,8 +1794,9 @@ class SmtpMsg(_PluginBase):
         """
         构建邮件
         """
+        from email.message import EmailMessage
         if not message:
-            message = MIMEMultipart()
+            message = EmailMessage()
             msg_html = self.__msg_build_read_email_template(text=text, image=image, title=title, userid=userid,
                                                             msg_type=msg_type)
             message = self.__msg_build_email_Header(message, title, sender_name, sender_mail)
@@ -2285,262 +1805,197 @@ class SmtpMsg(_PluginBase):
             return message
 
     @SmtpMsgDecorator.log("邮件头参数提取")
-    def _get_receiver_and_sender(self, log_container):
+    def _get_receiver_and_sender(self, smtp_settings, log_container):
         """
         读取收件人与发件人配置
         """
-        msg = level = None
         try:
-            try:
-                if self._receiver_mail:
-                    receiver_list = self._receiver_mail.split(",")
-                else:
-                    receiver_list = self._sender_mail
-            except Exception:
-                raise Exception('提取收件人配置失败')
-
-            try:
-                sender_name = self._sender_name if self._sender_name else self._sender_mail
-                sender_mail = self._sender_mail
-            except Exception:
-                raise Exception('提取发件人配置失败')
+            receiver_list = list(self._receiver_list) if self._receiver_list else [smtp_settings["mail"]]
+        except Exception:
+            raise Exception('提取收件人配置失败')
 
-            msg = '配置提取成功'
-            level = 1
-            return receiver_list, sender_name, sender_mail
-
-        except Exception as e:
-            msg = f'配置提取失败 - 原因 - {e}'
-            level = -1
-            raise Exception(msg)
+        try:
+            sender_mail = smtp_settings["mail"]
+            sender_name = self._sender_name if self._sender_name else sender_mail
+        except Exception:
+            raise Exception('提取发件人配置失败')
 
-        finally:
-            log_container['msg'] = msg
-            log_container['level'] = level
+        log_container.msg = '配置提取成功'
+        log_container.level = 1
+        return receiver_list, sender_name, sender_mail
 
     @SmtpMsgDecorator.log("模板导入")
     def __msg_build_read_email_template(self, text, image, title, userid, msg_type, log_container):
-        msg = level = None
         try:
-            try:
-                if self._enabled_customizable_mail_template:
-                    template = self.custom_template
-                else:
-                    template = self.default_template
-                with open(template, "r", encoding="utf-8") as template_file:
-                    template_content = template_file.read()
-            except FileNotFoundError as e:
-                raise Exception(f"没有找到邮件模板文件 - {e}")
-            except PermissionError as e:
-                raise Exception(f"无法读取邮件模板文件 - {e}")
-            except IsADirectoryError as e:
-                raise Exception(f"提供了一个目录地址，不是模板文件 - {e}")
-            except UnicodeDecodeError as e:
-                raise Exception(f"包含非 UTF-8 编码的内容，尝试用 UTF-8 编码读取邮件模板失败 - {e}")
-            except Exception as e:
-                raise Exception(f"邮件模板文件读取失败，出现了未知错误 - {e}")
-            try:
-                msg_html = template_content.format(text=text, image=image, title=title, userid=userid,
-                                                   msg_type=msg_type)
-            except KeyError as e:
-                raise Exception(f"邮件模板文件中导入了不被支持的变量 - {e}")
-            except Exception as e:
-                raise Exception(f"邮件模板文件在导入变量时遇到了未知错误 - {e}")
-            msg = f"成功提取邮件模板并导入变量"
-            level = 1
-            return msg_html
+            if self._enabled_customizable_mail_template:
+                template = self.custom_template
+            else:
+                template = self.default_template
+            template_key = (str(template), template.stat().st_mtime_ns)
+            # 先加载模板，读取失败与渲染失败分开汇报
+            _compiled_template(*template_key)
+        except FileNotFoundError as e:
+            raise Exception(f"没有找到邮件模板文件 - {e}") from e
+        except PermissionError as e:
+            raise Exception(f"无法读取邮件模板文件 - {e}") from e
+        except IsADirectoryError as e:
+            raise Exception(f"提供了一个目录地址，不是模板文件 - {e}") from e
+        except UnicodeDecodeError as e:
+            raise Exception(f"包含非 UTF-8 编码的内容，尝试用 UTF-8 编码读取邮件模板失败 - {e}") from e
         except Exception as e:
-            msg = e
-            level = -1
-            raise Exception(e)
-        finally:
-            log_container['msg'] = msg
-            log_container['level'] = level
+            raise Exception(f"邮件模板文件读取失败，出现了未知错误 - {e}") from e
+        try:
+            msg_html = _render_template(*template_key, text, image, title, userid, msg_type)
+        except KeyError as e:
+            raise Exception(f"邮件模板文件中导入了不被支持的变量 - {e}") from e
+        except Exception as e:
+            raise Exception(f"邮件模板文件在导入变量时遇到了未知错误 - {e}") from e
+        log_container.msg = "成功提取邮件模板并导入变量"
+        log_container.level = 1
+        return msg_html
 
     @SmtpMsgDecorator.log("邮件头构建")
     def __msg_build_email_Header(self, message, title, sender_name, sender_mail, log_container):
-        msg = level = None
+        from email.errors import HeaderParseError, MessageDefect
+        from email.headerregistry import Address
+        from email.utils import formataddr
         try:
+            del message['Subject']
+            # 邮件头不允许换行，多行标题合并为一行
+            message['Subject'] = " ".join(title.splitlines())
+        except HeaderParseError as e:
+            raise Exception(f'邮件主题包含无效的头部信息或无法解析的内容 - {e}') from e
+        except UnicodeEncodeError as e:
+            raise Exception(f'邮件主题包含无法编码为 UTF-8 的字符 - {e}') from e
+        except TypeError as e:
+            raise Exception(f'接受到非字符串类型的邮件主题 - {e}') from e
+        except Exception as e:
+            raise Exception(f'邮件主题构建失败，出现了未知错误 - {e}') from e
+        try:
+            del message['From']
             try:
-                del message['Subject']
-                message['Subject'] = Header(title, "utf-8")
-            except HeaderParseError as e:
-                raise Exception(f'邮件主题包含无效的头部信息或无法解析的内容 - {e}')
-            except UnicodeEncodeError as e:
-                raise Exception(f'邮件主题包含无法编码为 UTF-8 的字符 - {e}')
-            except TypeError as e:
-                raise Exception(f'接受到非字符串类型的邮件主题 - {e}')
-            except Exception as e:
-                raise Exception(f'邮件主题构建失败，出现了未知错误 - {e}')
-            try:
-                del message['From']
-                message['From'] = f'{sender_name} <{sender_mail}>'
-            except HeaderParseError as e:
-                raise Exception(f'发件人用户名包含无效的头部信息或无法解析的内容 - {e}')
-            except UnicodeEncodeError as e:
-                raise Exception(f'发件人用户名包含无法编码为 UTF-8 的字符 - {e}')
-            except TypeError as e:
-                raise Exception(f'接受到非字符串类型的发件人用户名 - {e}')
-            except Exception as e:
-                raise Exception(f'发件人用户名写入失败，出现了未知错误 - {e}')
-            level = 0
-            msg = '邮件头构建成功'
-            return message
+                message['From'] = Address(display_name=sender_name, addr_spec=sender_mail)
+            except MessageDefect:
+                # 账号不是完整的邮箱地址时 Address 会拒绝，按原样写入
+                message['From'] = formataddr((sender_name, sender_mail))
+        except HeaderParseError as e:
+            raise Exception(f'发件人用户名包含无效的头部信息或无法解析的内容 - {e}') from e
+        except UnicodeEncodeError as e:
+            raise Exception(f'发件人用户名包含无法编码为 UTF-8 的字符 - {e}') from e
+        except TypeError as e:
+            raise Exception(f'接受到非字符串类型的发件人用户名 - {e}') from e
         except Exception as e:
-            msg = f'邮件头构建失败 - 原因 - {e}'
-            raise Exception(e)
-        finally:
-            log_container['msg'] = msg
-            log_container['level'] = level
+            raise Exception(f'发件人用户名写入失败，出现了未知错误 - {e}') from e
+        log_container.msg = '邮件头构建成功'
+        log_container.level = 0
+        return message
 
     @SmtpMsgDecorator.log("邮件体构建")
     def __msg_build_email_body(self, message, image, msg_html, log_container):
-        msg = level = None
-        try:
-            message_alternative = MIMEMultipart('alternative')
-            message.attach(message_alternative)
-
-            image_mime = self.___msg_build_email_body_embed_image(image)
-            if image_mime:
-                message.attach(image_mime)
-            html_part = MIMEText(msg_html, 'html', 'utf-8')
-            message_alternative.attach(html_part)
-            level = 1
-            msg = '邮件体构建成功'
-            return message
-        except Exception as e:
-            level = -1
-            msg = f'邮件体构建失败 - {e}'
-            raise Exception(msg)
-        finally:
-            log_container['msg'] = msg
-            log_container['level'] = level
+        message.set_content(msg_html, subtype='html', cte='base64')
+        image_part = self.___msg_build_email_body_embed_image(image)
+        if image_part:
+            # 正文与内嵌图片组成 multipart/related，正文通过 cid:image 引用图片
+            message.make_related()
+            message.attach(image_part)
+        log_container.msg = '邮件体构建成功'
+        log_container.level = 1
+        return message
 
     @SmtpMsgDecorator.log("图片嵌入")
     def ___msg_build_email_body_embed_image(self, image, log_container):
-        msg = level = image_mime = image_timeout = None
-        if self._send_image:
-            if image:
-                try:
-                    try:
-                        image_path = Path(image).resolve()
-                        if image_path.is_file():
-                            with open(image, 'rb') as image_file:
-                                image_data = image_file.read()
-                        else:
-                            image_url = new_proxies = response = None
-                            parsed_url = urllib.parse.urlparse(image)
-                            if parsed_url.scheme in set(urllib.parse.uses_netloc):
-                                proxies = settings.PROXY if self._enabled_proxy_image else None
-                                github_proxy = settings.GITHUB_PROXY if self._enabled_github_proxy_image else None
-                                try:
-                                    if self._image_timeout:
-                                        if float(self._image_timeout) > 0:
-                                            image_timeout = float(self._image_timeout)
-                                    else:
-                                        image_timeout = float(10)
-                                except (TypeError, ValueError):
-                                    image_timeout = float(10)
-                                domain = parsed_url.netloc
-                                domains = ['github.com', 'githubapp.com',  'githubengineering.com', 'githubstatus.com',
-                                           'github.blog', 'githubusercontent.com', 'github.dev', 'githubtraining.com',
-                                           'github.io', 'githubcloud.com', 'githubpages.com']
-                                for github_domain in domains:
-                                    if domain == github_domain or domain.endswith('.' + github_domain):
-                                        image_url = urllib.parse.urljoin(github_proxy, image)
-                                        new_proxies = None
-                                    else:
-                                        image_url = image
-                                        new_proxies = proxies
-                                try:
-                                    response = requests.get(url=image_url, proxies=new_proxies, timeout=image_timeout)
-                                    if response.status_code == 200:
-                                        image_data = response.content
-                                    else:
-                                        raise Exception(f"状态码：{response.status_code}")
-                                except Exception as e:
-                                    if proxies is not None:
-                                        try:
-                                            response = requests.get(url=image, proxies=proxies, timeout=image_timeout)
-                                            if response.status_code == 200:
-                                                image_data = response.content
-                                            else:
-                                                raise Exception(f"状态码：{response.status_code}")
-                                        except Exception as e:
-                                            raise Exception(f'获取图片都失败 - 原因 - {e}')
-                                    else:
-                                        raise Exception(f'获取图片都失败 - 原因 - {e}')
-                                finally:
-                                    if response:
-                                        response.close()
-                    except requests.exceptions.RequestException as e:
-                        raise Exception(f"请求图片失败 - {e}")
-                    except TypeError as e:
-                        raise Exception(f"接受不支持的数据 - {e}")
-                    except FileNotFoundError as e:
-                        raise Exception(f"文件路径不存在 - {e}")
-                    except PermissionError as e:
-                        raise Exception(f"没有权限读取图片文件 - {e}")
-                    except IsADirectoryError as e:
-                        raise Exception(f"提供了一个目录地址，不是图片文件 - {e}")
-                    except Exception as e:
-                        raise Exception(e)
-                    if image_data:
-                        image_mime = MIMEImage(image_data)
-                        image_mime.add_header('Content-ID', '<image>')
-                        level = 1
-                        msg = '图片文件嵌入成功'
-                    else:
-                        raise Exception("无法获取图像数据")
-                except Exception as e:
-                    level = 2
-                    msg = f'出现错误，跳过嵌入 - 原因 - {e}'
-            else:
-                level = 2
-                msg = '未传入图片参数，跳过图片嵌入'
-        elif not self._send_image:
-            level = 1
-            msg = '未开启发送图片，抛弃图片数据'
-        log_container['msg'] = msg
-        log_container['level'] = level
-        return image_mime
+        if not self._send_image:
+            log_container.msg = '未开启发送图片，抛弃图片数据'
+            log_container.level = 1
+            return None
+        if not image:
+            log_container.msg = '未传入图片参数，跳过图片嵌入'
+            log_container.level = 2
+            return None
+        try:
+            image_data = self.__read_image_data(image)
+            if not image_data:
+                raise Exception("无法获取图像数据")
+            image_part = _build_image_part(image_data)
+        except Exception as e:
+            log_container.msg = f'出现错误，跳过嵌入 - 原因 - {e}'
+            log_container.level = 2
+            return None
+        log_container.msg = '图片文件嵌入成功'
+        log_container.level = 1
+        return image_part
+
+    def __read_image_data(self, image) -> bytes:
+        """
+        按图片参数的类型读取图片数据
+        """
+        kind, match = _classify_image(image)
+        try:
+            if kind == "bytes":
+                return bytes(image)
+            if kind == "base64":
+                return base64.b64decode(match.group('base64_data'), validate=True)
+            if kind == "url":
+                return self.__fetch_image_url(image)
+            if kind == "file":
+                return _read_image_file(Path(image).resolve())
+        except binascii.Error as e:
+            raise Exception(f"图片的 base64 数据无法解码 - {e}") from e
+        except FileNotFoundError as e:
+            raise Exception(f"文件路径不存在 - {e}") from e
+        except PermissionError as e:
+            raise Exception(f"没有权限读取图片文件 - {e}") from e
+        except IsADirectoryError as e:
+            raise Exception(f"提供了一个目录地址，不是图片文件 - {e}") from e
+        raise Exception(f"接受不支持的数据，既不是图片文件、URL，也不是 base64 数据 - {str(image)[:100]}")
+
+    def __fetch_image_url(self, image: str) -> bytes:
+        """
+        获取网络图片，相同 URL 在缓存有效期内不再重复下载
+        """
+        image_data = _get_cached_url_image(image)
+        if image_data is None:
+            image_data = self.__download_image_url(image)
+            _cache_url_image(image, image_data)
+        return image_data
+
+    def __download_image_url(self, image: str) -> bytes:
+        """
+        下载网络图片，Github 域名优先使用加速站，失败时使用全局代理再次获取
+        """
+        proxies = settings.PROXY if self._enabled_proxy_image else None
+        github_proxy = settings.GITHUB_PROXY if self._enabled_github_proxy_image else None
+        domain = urllib.parse.urlsplit(image).hostname or ""
+        if domain in _GITHUB_DOMAINS or domain.endswith(_GITHUB_DOMAIN_SUFFIXES):
+            image_url = f"{github_proxy}{image}" if github_proxy else image
+            new_proxies = None
+        else:
+            image_url = image
+            new_proxies = proxies
+        try:
+            return _download_image(image_url, new_proxies, self._fetch_timeout)
+        except Exception as e:
+            # 第一次已经使用全局代理获取时，不再重复获取
+            if proxies is None or (image_url, new_proxies) == (image, proxies):
+                raise Exception(f'获取图片都失败 - 原因 - {e}') from e
+        try:
+            return _download_image(image, proxies, self._fetch_timeout)
+        except Exception as e:
+            raise Exception(f'获取图片都失败 - 原因 - {e}') from e
 
     # log
 
     @SmtpMsgDecorator.clean_log()
     @SmtpMsgDecorator.log("结果汇报")
-    def _generate_result_log(self, m_success, s_success, log_container):
-        s_msg = m_msg = msg = level = None
-        test_type = "测试" if self._test else ""
-        try:
-            if m_success is True:
-                m_msg = f"主服务器发送{test_type}邮件成功！"
-            elif m_success is False:
-                m_msg = f"主服务器发送{test_type}邮件失败！"
-            elif m_success is None:
-                m_msg = f""
-
-            if s_success is True:
-                s_msg = f"备用服务器发送{test_type}邮件成功！"
-            elif s_success is False:
-                s_msg = f"备用服务器发送{test_type}邮件失败！"
-            elif s_success is None:
-                s_msg = f""
-
-            if m_success is not None and s_msg is not None:
-                msg = f"{m_msg} {s_msg}"
-            elif m_success is None and s_msg is None:
-                msg = f"未启用主服务器与备用服务器！无法发送{test_type}邮件！"
-
-            level = 0
-            if self._test:
-                return msg
-        except Exception as e:
-            level = -1
-            raise Exception(e)
-        finally:
-            log_container['msg'] = msg
-            log_container['level'] = level
+    def _generate_result_log(self, m_success, s_success, log_container, test=False):
+        result = _RESULT_MESSAGES.get((m_success, s_success))
+        if result is None:
+            raise Exception(f"无法识别的发送结果 - 主服务器：{m_success} - 备用服务器：{s_success}")
+        msg = result.format(test_type="测试" if test else "")
+        log_container.msg = msg
+        log_container.level = 0
+        if test:
+            return msg
 
     @staticmethod
     @SmtpMsgDecorator.clean_log()